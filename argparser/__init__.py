@@ -1,5 +1,5 @@
 from . import parsing
-from .classes import GroupConfig, argument
+from .classes import GroupConfig, ParseResult, argument
 from .headers import types_c_export as types
 
 __all__ = [
@@ -7,4 +7,5 @@ __all__ = [
     "parsing",
     "argument",
     "GroupConfig",
+    "ParseResult",
 ]
@@ -2,5 +2,14 @@ from .argument import argument
 from .argument_group import ArgumentGroup
 from .group_config import GroupConfig
 from .group_lookup import GroupLookup
+from .lazy_group import LazyArgumentGroup
+from .parse_result import ParseResult
 
-__all__ = ["ArgumentGroup", "argument", "GroupConfig", "GroupLookup"]
+__all__ = [
+    "ArgumentGroup",
+    "argument",
+    "GroupConfig",
+    "GroupLookup",
+    "LazyArgumentGroup",
+    "ParseResult",
+]
@@ -1,7 +1,10 @@
+import asyncio
+import inspect
 import re
 import shutil
+import time
 import warnings
-from typing import Any, Callable, Literal, Sequence
+from typing import Any, Callable, Iterable, Iterator, Literal, Sequence
 
 from .. import formatter, utils
 from ..headers.definitions import IArgument
@@ -11,12 +14,24 @@ from ..headers.types_c import (
     HandleReSet,
     MatchArgRegex,
     Parameter,
+    bulk,
     callback,
     null,
 )
+from ..utils.timeout import _TimedOut  # pyright: ignore[reportPrivateUsage]
+from .parse_result import ParseResult
 
 __all__ = ["argument"]
 
+
+def _loop_running() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
 type _HRD = Literal["t", "s", "r"]
 
 
@@ -29,6 +44,7 @@ class argument[T](IArgument[T]):
         re_set: HandleReSet = "s",
         kwargs: dict[str, Any] | None = None,
         resolution_order: int | None = None,
+        accumulate: bool = False,
     ) -> "argument[bool]":
         """A helper method for creating a flag. This is just a wrapper around class the init method."""
         return argument(
@@ -42,6 +58,7 @@ class argument[T](IArgument[T]):
             kwargs=kwargs,
             re_set=re_set,
             resolution_order=resolution_order,
+            accumulate=accumulate,
         )
 
     def __init__(
@@ -52,22 +69,30 @@ class argument[T](IArgument[T]):
         required: bool = False,
         default: T | Callable[[], T] | null = null(),
         d_type: Callable[[str], Any] | None = None,
-        constraints: list[str] | Callable[[str], bool] | None = None,
+        constraints: utils.Constraint | list[str] | Callable[[str], bool] | None = None,
         kwargs: dict[str, Any] | None = None,
         re_set: HandleReSet = "rs",
         resolution_order: int | None = None,
+        cache: bool | Literal["paths"] = False,
+        remainder: bool = False,
+        accumulate: bool = False,
+        timeout: float | None = None,
+        stream: bool = False,
     ) -> None:
         self.__names: list[str] = self.__validate_names(names)
         self.__alias: str | None = self.__validate_alias(alias)
         self.__position: int | None = position
         self.__required: bool = required
         self.__d_type: Callable[[str], Any] | None = d_type
-        self.__constraints: list[str] | Callable[[str], bool] | None = constraints
+        self.__constraints: (
+            utils.Constraint | list[str] | Callable[[str], bool] | None
+        ) = constraints
+        self.__constraint: utils.Constraint | None = None
+        self.__has_param_constraints: bool = False
         self.__kwargs: dict[str, Any] | None = kwargs
         self.__handle_re_set: tuple[_HRD, _HRD] = self.__parse_hrd(re_set)
 
         self.__default: T | Callable[[], T] | null = default
-        self.__obj: T | null = null()
 
         self.__parse_function: Callable[..., T]
         self.__parse_function_type: FuncType
@@ -79,9 +104,16 @@ class argument[T](IArgument[T]):
         self.__docstring: str | None = None
         self.__include_func_name: bool
 
-        self.__resolved: bool = False
         self.__resolution_order: int | None = self.__parse_res_order(resolution_order)
 
+        self.__cache: bool | Literal["paths"] = cache
+        self.__memo: utils.DiskMemo | None = None
+        self.__remainder: bool = remainder
+        self.__accumulate: bool = accumulate
+        self.__timeout: float | None = timeout
+        self.__stream: bool = stream
+        self.__lazy: utils.LazyCaster | None = None
+
     def __parse_hrd(self, hrd: HandleReSet) -> tuple[_HRD, _HRD]:
         match hrd:
             case "t" | "r" | "s":
@@ -89,6 +121,20 @@ class argument[T](IArgument[T]):
             case _:
                 return tuple(hrd)  # pyright: ignore[reportReturnType]
 
+    def __validate_accumulate(self, func: Callable[..., Any]) -> None:
+        if self.is_flag:
+            count = inspect.signature(func).parameters.get("count")
+            if count is None or count.kind != count.KEYWORD_ONLY:
+                raise ArgumentError(
+                    f"Accumulating flag {self.__names} must take the number of times "
+                    + "it was given as a keyword-only parameter: `*, count: int`"
+                )
+        elif self.__max_args != "+":
+            raise ArgumentError(
+                f"Accumulating argument {self.__names} is called once with the values "
+                + "of every occurrence, so it must take a variable number of values"
+            )
+
     def __warn_and_raise(self) -> None:
         if self.__required and self.is_flag:
             warnings.warn(
@@ -145,19 +191,19 @@ class argument[T](IArgument[T]):
         return cleaned_names
 
     def resolve(self) -> None:
-        if self.__required and not self.__resolved:
+        if self.__required and not ParseResult.current().is_resolved(self):
             raise ParsingError(
                 f"Argument {self.__names} is required but was not specified"
             )
 
-    def parse(self, group_parent: Any, args: list[str], from_config: bool) -> None:
+    def __should_parse(self, result: ParseResult, from_config: bool) -> bool:
         match self.__handle_re_set:
-            case _ if not self.__resolved:
+            case _ if not result.is_resolved(self):
                 pass
             case ("s", _) if not from_config:
-                return None
+                return False
             case (_, "s") if from_config:
-                return None
+                return False
             case ("r", _) if not from_config:
                 raise ParsingError(f"Argument {self.__names} given multiple times")
             case (_, "r") if from_config:
@@ -165,13 +211,107 @@ class argument[T](IArgument[T]):
             case _:
                 pass
 
-        self.__obj = self.__parse_function(
-            *((group_parent,) if group_parent else ()),
-            *self.__validate_args(args),
-            **(self.__kwargs or {}),
+        return True
+
+    def parse(
+        self,
+        group_parent: Any,
+        args: list[str],
+        from_config: bool,
+        occurrences: int = 1,
+    ) -> None:
+        result = ParseResult.current()
+
+        if not self.__should_parse(result, from_config):
+            return None
+
+        kwargs = self.__kwargs or {}
+        if self.__accumulate and self.is_flag:
+            kwargs = {**kwargs, "count": occurrences}
+
+        result.set(
+            self,
+            self.__invoke(
+                result,
+                (
+                    *((group_parent,) if group_parent else ()),
+                    *self.__validate_args(args),
+                ),
+                kwargs,
+            ),
+            from_config,
+        )
+
+    def __invoke(
+        self, result: ParseResult, args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> T:
+        func = self.__memo or self.__parse_function
+
+        limit = self.__timeout
+        if (remaining := result.remaining()) is not None:
+            limit = remaining if limit is None else min(limit, remaining)
+
+        start = time.perf_counter()
+        if limit is None:
+            value = func(*args, **kwargs)
+            # Inside a running event loop the coroutine is stored for the caller
+            # to await
+            if inspect.iscoroutine(value) and not _loop_running():
+                value = asyncio.run(value)
+        else:
+            try:
+                if limit <= 0:
+                    raise _TimedOut
+                value = utils.call_with_timeout(func, args, kwargs, limit)
+            except _TimedOut:
+                elapsed = time.perf_counter() - start
+                result.record_time(self, elapsed)
+                raise self.__timeout_error(result, elapsed, limit) from None
+
+        result.record_time(self, time.perf_counter() - start)
+        return value
+
+    def __timeout_error(
+        self, result: ParseResult, elapsed: float, limit: float
+    ) -> ParsingError:
+        if limit == self.__timeout:
+            return ParsingError(
+                f"Argument {self.__names} timed out after {elapsed:.3f}s "
+                + f"(timeout={self.__timeout}s)"
+            )
+
+        slowest = ", ".join(
+            f"{arg.sort_key} {seconds:.3f}s" for arg, seconds in result.timings()[:3]
+        )
+        return ParsingError(
+            f"Deadline of resolve exceeded by argument {self.__names} after "
+            + f"{elapsed:.3f}s (slowest: {slowest})"
         )
 
-        self.__resolved = True
+    def check(self, args: list[str], from_config: bool, occurrences: int = 1) -> None:
+        """Validate `args` as `parse` would (arity, constraints and casting)
+        without calling the parse function. The arg is marked resolved with a
+        null value."""
+
+        result = ParseResult.current()
+
+        if not self.__should_parse(result, from_config):
+            return None
+
+        _min, _max = self.__min_args, self.__max_args
+        if len(args) < _min or (_max != "+" and len(args) > _max):
+            expected = (
+                f"{_min}+"
+                if _max == "+"
+                else _min if _min == _max else f"{_min}-{_max}"
+            )
+            raise ParsingError(
+                f"Argument {self.__names} takes {expected} values but was given "
+                + f"{len(args)}: {args}"
+            )
+
+        self.__validate_args(args, eager=True)
+        result.set(self, null(), from_config)
 
     @property
     def resolution_order(self) -> int | None:
@@ -189,6 +329,14 @@ class argument[T](IArgument[T]):
         # Why isn't this always false? I hate this. Why?
         return self.__min_args == self.__max_args == 0
 
+    @property
+    def is_remainder(self) -> bool:
+        return self.__remainder
+
+    @property
+    def accumulates(self) -> bool:
+        return self.__accumulate
+
     @property
     def consumes(self) -> tuple[int, int | Literal["+"]]:
         return self.__min_args, self.__max_args
@@ -197,68 +345,116 @@ class argument[T](IArgument[T]):
     def parse_func_type(self) -> FuncType:
         return self.__parse_function_type
 
-    def __validate_constraints(self, args: list[str]) -> None:
-        failed_w_list: str = "Args {0} are not in constraints {1}"
-        failed_w_func: str = "Args {0} returned False when passed to validator function"
-
-        if isinstance(self.__constraints, list):
-            is_valid: list[bool] = [arg in self.__constraints for arg in args]
-            if all(is_valid):
-                return None
-            failed_args = [arg for valid, arg in zip(is_valid, args) if not valid]
-            raise ValueError(
-                failed_w_list.format(list(failed_args), self.__constraints)
-            )
-        elif callable(self.__constraints):
-            is_valid: list[bool] = list(map(self.__constraints, args))
-            if all(is_valid):
-                return None
-            failed_args = [arg for valid, arg in zip(is_valid, args) if not valid]
-            raise ValueError(failed_w_func.format(list(failed_args)))
+    def __validate_param_constraints(self, args: list[str], values: list[Any]) -> None:
+        if not any(param.constraints for param in self.__param_list):
+            return None
 
         num_params: int = len(self.__param_list)
-        for c, arg in enumerate(args):
-            param = self.__param_list[c * (c < num_params) or -1]
-            if not param.constraints or arg in param.constraints:
+        for c, (arg, value) in enumerate(zip(args, values)):
+            param = self.__param_list[c if (c < num_params) else -1]
+            if not param.constraints or value in param.constraints:
                 continue
             raise ValueError(f"Arg {arg!r} not in constraints {param.constraints}")
 
-    def __validate_args(self, args: list[str]) -> list[Any]:
-        self.__validate_constraints(args)
+    def __validate_args(self, args: list[str], eager: bool = False) -> list[Any]:
+        if self.__lazy is None:
+            return self.__validate_tokens(args)
+
+        # The lazy parameter is the last one. Its tokens are cast and checked one
+        # at a time, as the parse function iterates over them
+        num_params = len(self.__param_list) - 1
+        head, tail = args[:num_params], args[num_params:]
+        values = self.__validate_tokens(head)[:num_params]
+        if not tail and self.__param_list[-1].default != null:
+            return values
+
+        if self.__stream and len(tail) == 1 and utils.is_stream_token(tail[0]):
+            if not eager:
+                values.append(self.__iter_values(utils.read_tokens(tail[0])))
+        elif eager:
+            values.append(list(self.__iter_values(tail)))
+        else:
+            values.append(self.__iter_values(tail))
+
+        return values
+
+    def __iter_values(self, tokens: Iterable[str]) -> Iterator[Any]:
+        constraint = self.__constraint
+        lazy: utils.LazyCaster = self.__lazy  # type: ignore
+
+        if constraint is None:
+            return lazy(tokens)
+
+        def values() -> Iterator[Any]:
+            for token in tokens:
+                if not constraint.on_values:
+                    constraint.check((token,), (token,))
+                value = token if lazy.caster is None else lazy.caster(token)
+                if constraint.on_values:
+                    constraint.check((token,), (value,))
+                yield value
+
+        return values()
+
+    def __validate_tokens(self, args: list[str]) -> list[Any]:
+        constraint = self.__constraint
+
+        if constraint is not None and not constraint.on_values:
+            constraint.check(args, args)
+
+        values = self.__cast_args(args)
 
+        if constraint is None and not self.__has_param_constraints:
+            return values
+
+        flat_values = values
+        if len(values) != len(args) and self.__param_list[-1:]:
+            if self.__param_list[-1].packed and len(values) == len(self.__param_list):
+                flat_values = [*values[:-1], *values[-1]]
+
+        if constraint is not None and constraint.on_values:
+            constraint.check(args, flat_values)
+
+        self.__validate_param_constraints(args, flat_values)
+
+        return values
+
+    def __cast_args(self, args: list[str]) -> list[Any]:
         num_params: int = len(self.__param_list)
-        if self.__d_type:
+        if isinstance(self.__d_type, bulk):
+            return list(self.__d_type(args))
+        elif self.__d_type:
             return list(map(self.__d_type, args))
-        else:
-            arg_list: list[Any] = []
-            for c, arg in enumerate(args):
-
-                param = self.__param_list[c if (c < num_params) else -1]
-                if param.caster:
-                    try:
-                        arg_list.append(param.caster(arg))
-                    except:
-                        print(arg, param)
-                        raise
-                else:
-                    arg_list.append(arg)
-            return arg_list
+
+        arg_list: list[Any] = []
+        for c, arg in enumerate(args):
+            param = self.__param_list[c if (c < num_params) else -1]
+            if param.bulk_caster:
+                tail = args[c:]
+                if not param.packed:
+                    arg_list.extend(param.bulk_caster(tail))
+                elif tail or param.default == null:
+                    arg_list.append(param.bulk_caster(tail))
+                return arg_list
+
+            if param.caster:
+                arg_list.append(param.caster(arg))
+            else:
+                arg_list.append(arg)
+
+        if len(args) == num_params - 1:
+            param = self.__param_list[-1]
+            if param.bulk_caster and param.packed and param.default == null:
+                arg_list.append(param.bulk_caster(()))
+
+        return arg_list
 
     def __get_arg_callback(
         self,
     ) -> T | null:
-        return self.__obj
+        return ParseResult.current().get(self, self.__default)
 
     def __get__[K](self, instance: K, owner: type[K]) -> callback[T]:
-        # test_obj_empty = self.__obj.obj if isinstance(self.__obj, Store) else self.__obj
-        if isinstance(self.__obj, null):
-            if callable(self.__default):
-                self.__obj = (
-                    self.__default()
-                )  # pyright: ignore[reportAttributeAccessIssue]
-            else:
-                self.__obj = self.__default
-
         return callback(self.__parse_function.__name__, self.__get_arg_callback)
 
     def __call__[E](self, func: Callable[..., E]) -> "argument[E]":
@@ -275,6 +471,8 @@ class argument[T](IArgument[T]):
             self.__d_type = func_signature.d_type
         if self.__constraints is None:
             self.__constraints = func_signature.constraints
+        self.__constraint = utils.compile_constraint(self.__constraints)
+        self.__has_param_constraints = any(i.constraints for i in self.__param_list)
 
         if not self.__names or self.__include_func_name:
 
@@ -284,6 +482,32 @@ class argument[T](IArgument[T]):
 
         self.__parse_function = func  # pyright: ignore[reportAttributeAccessIssue]
 
+        if self.__cache:
+            if self.__parse_function_type == FuncType.INSTANCE_METHOD:
+                raise ArgumentError(
+                    f"Argument {self.__names} can't be cached as it depends on the "
+                    + "group instance. Use a static or class method"
+                )
+            self.__memo = utils.DiskMemo(func, stamp_paths=self.__cache == "paths")
+
+        if self.__remainder and self.__max_args != "+":
+            raise ArgumentError(
+                f"Argument {self.__names} takes the values after '--' so it must "
+                + "take a variable number of values"
+            )
+
+        if self.__accumulate:
+            self.__validate_accumulate(func)
+
+        if self.__param_list and self.__param_list[-1].packed:
+            if isinstance(lazy := self.__param_list[-1].bulk_caster, utils.LazyCaster):
+                self.__lazy = lazy
+        if self.__stream and self.__lazy is None:
+            raise ArgumentError(
+                f"Argument {self.__names} reads its values from a stream, so its "
+                + "last parameter must be an iterator: `values: Iterator[T]`"
+            )
+
         self.__warn_and_raise()
 
         return self  # pyright: ignore[reportReturnType]
@@ -298,9 +522,10 @@ class argument[T](IArgument[T]):
             if self.__resolution_order is not None
             else ""
         )
-        resolved = f"resolved={self.__resolved}, "
+        result = ParseResult.current()
+        resolved = f"resolved={result.is_resolved(self)}, "
         nargs = f"nargs=({self.__min_args},{self.__max_args}), "
-        obj = f"holds={self.__obj}"
+        obj = f"holds={result.peek(self)}"
 
         return f"{argument.__name__}({nargs}{alias}{names}{position}{res_ord}{resolved}{default}{obj})"
 
@@ -355,13 +580,12 @@ class argument[T](IArgument[T]):
             has_const = True
         const_str = f"{const_str[:-1]})" * has_const
 
-        if callable(self.__constraints) and (doc := self.__constraints.__doc__):
-            choices_str = f"{'constraints':<{about_fmt_width}}= " + re.sub(
-                r"\s{2,}", " ", doc.strip()
-            )
-        elif isinstance(self.__constraints, list):
-            choices_str = f"{'constraints':<{about_fmt_width}}= " + ",".join(
-                self.__constraints
+        if self.__constraint is not None and (desc := self.__constraint.describe()):
+            choices_str = f"{'constraints':<{about_fmt_width}}= " + desc
+        elif self.__has_param_constraints:
+            choices_str = f"{'constraints':<{about_fmt_width}}= " + " ".join(
+                ",".join(map(str, param.constraints or ("*",)))
+                for param in self.__param_list
             )
 
         if self.__d_type is not None:
@@ -385,6 +609,9 @@ class argument[T](IArgument[T]):
             f"{'info':<{about_fmt_width-1}}"
             + ("*= " if self.__required else " = ")
             + f"n={nargs_str}"
+            + (",after=--" if self.__remainder else "")
+            + (",repeatable" if self.__accumulate else "")
+            + (",stdin=-" if self.__stream else "")
             + (f",p={self.__position}" if self.__position is not None else "")
             + default_str
             + const_str
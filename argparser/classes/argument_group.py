@@ -1,15 +1,36 @@
+import bisect
 import re
 from typing import Any, Generator, Sequence
 
+from .. import utils
 from ..headers.definitions import IArgument, IArgumentGroup, IGroupConfig
-from ..headers.exceptions import ArgumentError
+from ..headers.exceptions import ArgumentError, ParsingError
 from ..headers.types_c import FuncType
+from .parse_result import ParseResult
 
 type _PArgTuple = tuple[IArgument[Any], *tuple[str, ...]]
+type _Occurrences = tuple[IArgument[Any], list[str], int]
 
 __all__ = ["ArgumentGroup"]
 
 
+_BIND_NONE, _BIND_CLASS, _BIND_INSTANCE = range(3)
+
+
+def _order_key(arg_obj: IArgument[Any]) -> tuple[int, int | str]:
+    # Positive resolution orders first, then unordered args by name, then
+    # negative resolution orders
+    if (ro := arg_obj.resolution_order) is None:
+        return (1, arg_obj.sort_key)
+    return (0, ro) if ro >= 0 else (2, ro)
+
+
+def _alias_slot(char: str) -> int:
+    # A-Z -> 0-25, a-z -> 26-51
+    o = ord(char)
+    return o - 65 if o < 97 else o - 71
+
+
 class ArgumentGroup(IArgumentGroup):
     def __init__(
         self,
@@ -28,9 +49,10 @@ class ArgumentGroup(IArgumentGroup):
 
         self.__mapped_args: dict[str | int, IArgument[Any]] = {}
         self.__mapped_positions: list[IArgument[Any]] = []
-        self.__resolution_list: list[_PArgTuple] = []
-
-        self.__group_parent_instance: object | None = None
+        self.__alias_table: list[IArgument[Any] | None] = [None] * 52
+        self.__name_trie: utils.PrefixTrie[IArgument[Any]] | None = None
+        self.__suggestion_index: utils.SuggestionIndex | None = None
+        self.__remainder_arg: IArgument[Any] | None = None
 
         mapped_positions: list[tuple[int, IArgument[Any]]] = []
 
@@ -39,8 +61,22 @@ class ArgumentGroup(IArgumentGroup):
             self.__mapped_args.update(dict.fromkeys(names, arg_obj))
             if alias:
                 self.__mapped_args[alias] = arg_obj
+                self.__alias_table[_alias_slot(alias[1])] = arg_obj
             if position is not None:
                 mapped_positions.append((position, arg_obj))
+            if arg_obj.is_remainder:
+                if self.__remainder_arg is not None:
+                    raise ArgumentError(
+                        f"Only one argument can take the values after '--'\nraised by:"
+                        + f"\n\t{self.__group_parent}"
+                    )
+                self.__remainder_arg = arg_obj
+
+        if self.__config.allow_abbrev:
+            self.__name_trie = utils.PrefixTrie()
+            for name, arg_obj in self.__mapped_args.items():
+                if isinstance(name, str) and name.startswith("--"):
+                    self.__name_trie.insert(name, arg_obj)
 
         mapped_positions.sort(key=lambda x: x[0])
 
@@ -66,49 +102,102 @@ class ArgumentGroup(IArgumentGroup):
             _min, _max = arg_obj.consumes
             if _min != _max:
                 raise_on_next = True
+            prev_pos = pos
 
             self.__mapped_positions.append(arg_obj)
 
-    def __resolution_order(self) -> Generator[_PArgTuple, None, None]:
-        # (-lt 0, -ge 0)
-        int_res_order: tuple[list[_PArgTuple], list[_PArgTuple]] = ([], [])
-        str_res_order: list[_PArgTuple] = []
+        # The resolution plan: a fixed rank for every arg, so a parse only has
+        # to drop the args it was given into their slots
+        self.__ordered: tuple[IArgument[Any], ...] = tuple(
+            sorted(self.__arguments, key=_order_key)
+        )
+        self.__keys: list[tuple[int, int | str]] = list(map(_order_key, self.__ordered))
+        self.__rank: dict[IArgument[Any], int] = {
+            arg_obj: c for c, arg_obj in enumerate(self.__ordered)
+        }
+        self.__bindings: dict[IArgument[Any], int] = {
+            arg_obj: self.__binding(arg_obj) for arg_obj in self.__ordered
+        }
 
-        for arg_tuple in self.__resolution_list:
-            if (ro := arg_tuple[0].resolution_order) is None:
-                str_res_order.append(arg_tuple)
-            elif ro < 0:
-                int_res_order[0].append(arg_tuple)
+    def clear(self) -> None:
+        ParseResult.current().clear_pending(self)
+
+    def __new_group_parent(self) -> object:
+        return self.__group_parent(
+            *self.__parent_init_args, **self.__parent_init_kwargs
+        )
+
+    def __binding(self, arg_obj: IArgument[Any]) -> int:
+        match arg_obj.parse_func_type:
+            case FuncType.STATIC_METHOD:
+                return _BIND_NONE
+            case FuncType.CLASS_METHOD:
+                return _BIND_CLASS
+            case FuncType.INSTANCE_METHOD:
+                return _BIND_INSTANCE
+
+    def __resolution_order(
+        self, resolution_list: list[_PArgTuple]
+    ) -> Generator[_Occurrences, None, None]:
+        # Slot 2*rank+1 holds the args of this group, slot 2*rank anything that
+        # isn't (like the builtin -c/-h args) and sorts just before that rank.
+        slots: list[list[_PArgTuple] | None] = [None] * (2 * len(self.__ordered) + 1)
+        rank = self.__rank
+
+        for arg_tuple in resolution_list:
+            if (i := rank.get(arg_tuple[0])) is not None:
+                i = 2 * i + 1
             else:
-                int_res_order[1].append(arg_tuple)
+                i = 2 * bisect.bisect_right(self.__keys, _order_key(arg_tuple[0]))
 
-        int_res_order[0].sort(key=lambda x: x[0].resolution_order or 0)
-        int_res_order[1].sort(key=lambda x: x[0].resolution_order or 0)
-        str_res_order.sort(key=lambda x: x[0].sort_key)
+            if (slot := slots[i]) is None:
+                slots[i] = [arg_tuple]
+            else:
+                slot.append(arg_tuple)
 
-        for i in int_res_order[1] + str_res_order + int_res_order[0]:
-            yield i
+        for slot in slots:
+            if slot is None:
+                continue
 
-    def clear(self) -> None:
-        self.__resolution_list.clear()
+            # Every occurrence of an arg lands in the same slot, so accumulating
+            # args are merged here into one call
+            if len(slot) > 1 and slot[0][0].accumulates:
+                yield slot[0][0], [i for arg_tuple in slot for i in arg_tuple[1:]], len(
+                    slot
+                )
+                continue
+
+            for arg_obj, *arg_strs in slot:
+                yield arg_obj, arg_strs, 1
+
+    def pending_args(self) -> list[_Occurrences]:
+        """The args given to this group in the current parse, in resolution order,
+        as `(arg, values, occurrences)`. The occurrences of an accumulating arg
+        are merged into one entry."""
+
+        return list(self.__resolution_order(ParseResult.current().pending(self)))
 
     def resolve(self, from_config: bool) -> None:
-        for arg_obj, *arg_strs in self.__resolution_order():
+        result = ParseResult.current()
+        bindings = self.__bindings
+
+        for arg_obj, arg_strs, occurrences in self.__resolution_order(
+            result.pending(self)
+        ):
             assert arg_obj is not None, "Should never be none. You fucked something up"
 
-            match arg_obj.parse_func_type:
-                case FuncType.STATIC_METHOD:
-                    group_parent = None
-                case FuncType.CLASS_METHOD:
-                    group_parent = self.__group_parent
-                case FuncType.INSTANCE_METHOD:
-                    if not self.__group_parent_instance:
-                        self.__group_parent_instance = self.__group_parent(
-                            *self.__parent_init_args, **self.__parent_init_kwargs
-                        )
-                    group_parent = self.__group_parent_instance
+            binding = bindings.get(arg_obj)
+            if binding is None:
+                binding = self.__binding(arg_obj)
+
+            if binding == _BIND_INSTANCE:
+                group_parent = result.group_instance(self, self.__new_group_parent)
+            elif binding == _BIND_CLASS:
+                group_parent = self.__group_parent
+            else:
+                group_parent = None
 
-            arg_obj.parse(group_parent, arg_strs, from_config)
+            arg_obj.parse(group_parent, arg_strs, from_config, occurrences)
 
         for arg in self.__arguments:
             arg.resolve()
@@ -117,15 +206,67 @@ class ArgumentGroup(IArgumentGroup):
         if x := self.__mapped_args.get(name, None):
             return x
 
-        raise KeyError(
+        if self.__name_trie is not None and name.startswith("--"):
+            arg_obj, candidates = self.__name_trie.match(name)
+            if arg_obj is not None:
+                return arg_obj
+            if candidates:
+                raise ParsingError(
+                    f"Ambiguous option {name!r} in argument group "
+                    + f"{self.__config.name!r} could match: {', '.join(candidates)}"
+                )
+
+        error = (
             f"No argument with key {name!r} in argument group {self.__config.name!r}"
         )
+        if suggestions := self.suggest(name):
+            error += f". Did you mean: {', '.join(suggestions)}?"
+
+        raise ParsingError(error)
+
+    def get_alias_cluster(self, cluster: str) -> tuple[list[IArgument[Any]], str]:
+        """Expand a cluster of aliases such as `-vn4` into its arguments.
+
+        Expansion stops at the first alias that takes values, and the rest of
+        the cluster is returned as its attached value (`"4"`), or `""` if there
+        is none."""
+
+        table = self.__alias_table
+        arg_objs: list[IArgument[Any]] = []
+
+        for c in range(1, len(cluster)):
+            o = ord(cluster[c])
+            slot = o - 65 if 65 <= o <= 90 else o - 71 if 97 <= o <= 122 else -1
+
+            if slot < 0 or (arg_obj := table[slot]) is None:
+                raise ParsingError(
+                    f"No argument with alias '-{cluster[c]}' in argument group "
+                    + f"{self.__config.name!r} (in {cluster!r})"
+                )
+
+            arg_objs.append(arg_obj)
+            if not arg_obj.is_flag:
+                return arg_objs, cluster[c + 1 :]
+
+        return arg_objs, ""
+
+    def suggest(self, name: str, k: int = 3, budget: float = 0.005) -> list[str]:
+        if not name.startswith("--"):
+            return []
+
+        if self.__suggestion_index is None:
+            self.__suggestion_index = utils.SuggestionIndex(
+                (i for i in self.__mapped_args if isinstance(i, str) and i[:2] == "--"),
+                strip="-",
+            )
+
+        return self.__suggestion_index.suggest(name, k=k, budget=budget)
 
     def group_name_matches(self, name: str) -> bool:
         return self.__config.name == name
 
     def set_args(self, *argument_tuple: _PArgTuple) -> None:
-        self.__resolution_list.extend(argument_tuple)
+        ParseResult.current().pending(self).extend(argument_tuple)
 
     @property
     def config(self) -> IGroupConfig:
@@ -135,6 +276,10 @@ class ArgumentGroup(IArgumentGroup):
     def positional_args(self) -> tuple[IArgument[Any], ...]:
         return tuple(self.__mapped_positions)
 
+    @property
+    def remainder_arg(self) -> IArgument[Any] | None:
+        return self.__remainder_arg
+
     @property
     def doc(self) -> str:
         if not (doc := self.__group_parent.__doc__):
@@ -144,22 +289,7 @@ class ArgumentGroup(IArgumentGroup):
 
     @property
     def ordered_arguments(self) -> list[IArgument[Any]]:
-        int_res_order: tuple[list[IArgument[Any]], list[IArgument[Any]]] = ([], [])
-        str_res_order: list[IArgument[Any]] = []
-
-        for arg in self.__arguments:
-            if (ro := arg.resolution_order) is None:
-                str_res_order.append(arg)
-            elif ro < 0:
-                int_res_order[0].append(arg)
-            else:
-                int_res_order[1].append(arg)
-
-        int_res_order[0].sort(key=lambda x: x.resolution_order or 0)
-        int_res_order[1].sort(key=lambda x: x.resolution_order or 0)
-        str_res_order.sort(key=lambda x: x.sort_key)
-
-        return int_res_order[1] + str_res_order + int_res_order[0]
+        return list(self.__ordered)
 
     def __repr__(self) -> str:
         name = f"name={self.__config.name!r}, "
@@ -13,10 +13,12 @@ class GroupConfig(IGroupConfig):
         name: str | None = None,
         required: bool = False,
         usage_example: str | None = None,
+        allow_abbrev: bool = False,
     ) -> None:
         self.__name = self.__validate_name(name)
         self.__required = required
         self.__usage_example = usage_example
+        self.__allow_abbrev = allow_abbrev
 
     def __validate_name(self, name: str | None) -> str | None:
         if not name:
@@ -52,3 +54,9 @@ class GroupConfig(IGroupConfig):
     @property
     def usage_example(self) -> str | None:
         return self.__usage_example
+
+    @property
+    def allow_abbrev(self) -> bool:
+        """Accept unique prefixes of long option names (and of group names when
+        set on the root group)."""
+        return self.__allow_abbrev
@@ -1,6 +1,9 @@
 import sys
 
+from .. import utils
 from ..headers.definitions import IArgumentGroup
+from ..headers.exceptions import ParsingError
+from .lazy_group import LazyArgumentGroup
 
 __all__ = ["GroupLookup"]
 
@@ -24,17 +27,60 @@ class GroupLookup:
         self.__groups: list[IArgumentGroup] = []
         self.__root_group: IArgumentGroup | None = None
         self.__prog: str
+        self.__group_trie: utils.PrefixTrie[IArgumentGroup] | None = None
+        self.__suggestion_index: utils.SuggestionIndex | None = None
 
     def add_group(self, arg_group: IArgumentGroup) -> None:
         self.__groups.append(arg_group)
+        self.__group_trie = None
+        self.__suggestion_index = None
+
+    def __load(self, arg_group: IArgumentGroup) -> IArgumentGroup:
+        if not isinstance(arg_group, LazyArgumentGroup):
+            return arg_group
+
+        loaded = arg_group.load()
+        if arg_group in self.__groups:
+            self.__groups[self.__groups.index(arg_group)] = loaded
+
+        return loaded
+
+    def __match_prefix(self, p_name: str) -> IArgumentGroup | None:
+        if self.__group_trie is None:
+            self.__group_trie = utils.PrefixTrie()
+            for arg_group in self.__groups:
+                if name := arg_group.config.name:
+                    self.__group_trie.insert(name, arg_group)
+
+        arg_group, candidates = self.__group_trie.match(p_name)
+        if candidates:
+            raise ParsingError(
+                f"Ambiguous group {p_name!r} could match: {', '.join(candidates)}"
+            )
+
+        return arg_group
 
     def get_group(self, p_name: str) -> IArgumentGroup | None:
+        """Find a group by name, importing it first if it was registered lazily."""
+
         for arg_group in self.__groups:
             if arg_group.group_name_matches(p_name):
-                return arg_group
+                return self.__load(arg_group)
+
+        if self.__root_group is not None and self.__root_group.config.allow_abbrev:
+            if (arg_group := self.__match_prefix(p_name)) is not None:
+                return self.__load(arg_group)
 
         return None
 
+    def suggest(self, p_name: str, k: int = 3, budget: float = 0.005) -> list[str]:
+        if self.__suggestion_index is None:
+            self.__suggestion_index = utils.SuggestionIndex(
+                (i.config.name for i in self.__groups if i.config.name), strip=":"
+            )
+
+        return self.__suggestion_index.suggest(p_name, k=k, budget=budget)
+
     def set_root_group(self, arg_group: IArgumentGroup, prog: str | None) -> None:
         self.__root_group = arg_group
         self.__prog = prog or sys.argv[0]
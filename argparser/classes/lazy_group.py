@@ -0,0 +1,93 @@
+import threading
+from typing import Any, Callable
+
+from ..headers.definitions import IArgument, IArgumentGroup, IGroupConfig
+
+__all__ = ["LazyArgumentGroup"]
+
+
+class LazyArgumentGroup(IArgumentGroup):
+    """Stands in for a group whose module has not been imported yet.
+
+    The name and doc are known up front so help can list the group. Anything
+    else loads the group (importing its module) and is passed on to it."""
+
+    def __init__(
+        self,
+        config: IGroupConfig,
+        doc: str,
+        loader: Callable[[], IArgumentGroup],
+    ) -> None:
+        self.__config = config
+        self.__doc = doc
+        self.__loader = loader
+        self.__loaded: IArgumentGroup | None = None
+        self.__lock = threading.Lock()
+
+    def load(self) -> IArgumentGroup:
+        if self.__loaded is None:
+            with self.__lock:
+                if self.__loaded is None:
+                    self.__loaded = self.__loader()
+
+        return self.__loaded
+
+    @property
+    def loaded(self) -> bool:
+        return self.__loaded is not None
+
+    def group_name_matches(self, name: str) -> bool:
+        return self.__config.name == name
+
+    def get_arg_by_name(self, name: str) -> IArgument[Any]:
+        return self.load().get_arg_by_name(name)
+
+    def get_alias_cluster(self, cluster: str) -> tuple[list[IArgument[Any]], str]:
+        return self.load().get_alias_cluster(cluster)
+
+    def suggest(self, name: str, k: int = 3, budget: float = 0.005) -> list[str]:
+        return self.load().suggest(name, k=k, budget=budget)
+
+    def set_args(
+        self, *argument_tuple: tuple[IArgument[Any], *tuple[str, ...]]
+    ) -> None:
+        self.load().set_args(*argument_tuple)
+
+    def pending_args(self) -> list[tuple[IArgument[Any], list[str], int]]:
+        return self.load().pending_args()
+
+    def clear(self) -> None:
+        self.load().clear()
+
+    def resolve(self, from_config: bool) -> None:
+        self.load().resolve(from_config)
+
+    @property
+    def positional_args(self) -> tuple[IArgument[Any], ...]:
+        return self.load().positional_args
+
+    @property
+    def remainder_arg(self) -> IArgument[Any] | None:
+        return self.load().remainder_arg
+
+    @property
+    def config(self) -> IGroupConfig:
+        if self.__loaded is not None:
+            return self.__loaded.config
+        return self.__config
+
+    @property
+    def ordered_arguments(self) -> list[IArgument[Any]]:
+        return self.load().ordered_arguments
+
+    @property
+    def doc(self) -> str:
+        if self.__loaded is not None and not self.__doc:
+            return self.__loaded.doc
+        return self.__doc
+
+    def __repr__(self) -> str:
+        name = f"name={self.__config.name!r}, "
+        loaded = f"loaded={self.loaded}"
+
+        return f"{LazyArgumentGroup.__name__}({name}{loaded})"
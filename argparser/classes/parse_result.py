@@ -0,0 +1,239 @@
+import contextlib
+import contextvars
+import time
+from pathlib import Path
+from typing import Any, Callable, Generator, Iterable
+
+from ..headers.definitions import IArgument, IArgumentGroup
+from ..headers.types_c import null
+
+type _PArgTuple = tuple[IArgument[Any], *tuple[str, ...]]
+
+__all__ = ["ParseResult"]
+
+
+def _reachable(values: Iterable[Any]) -> set[int]:
+    """Ids of `values` and of the items of those that are containers."""
+
+    ids: set[int] = set()
+    for value in values:
+        ids.add(id(value))
+        if isinstance(value, (list, tuple, set, frozenset, dict)):
+            items: Iterable[Any] = value.values() if isinstance(value, dict) else value
+            ids.update(map(id, items))
+
+    return ids
+
+
+def _close(resources: list[Any]) -> None:
+    while resources:
+        resource = resources.pop()
+        try:
+            resource.close()
+        except BufferError:
+            # A memoryview of it is still alive, it closes once collected
+            pass
+
+
+class ParseResult:
+    """Holds the state of a single parse: argument values, the group instances
+    created for instance methods and the args waiting to be resolved.
+
+    The result is bound to the current context with `contextvars`, so threads
+    and tasks that parse different command lines do not share values. Reading a
+    value is a context lookup and a dict lookup, with no locking. Contexts that
+    never bound a result read the most recently bound one."""
+
+    __current: contextvars.ContextVar["ParseResult | None"] = contextvars.ContextVar(
+        "argparser_parse_result", default=None
+    )
+    __latest: "ParseResult | None" = None
+
+    def __init__(self) -> None:
+        self.__values: dict[IArgument[Any], Any] = {}
+        self.__resolved: set[IArgument[Any]] = set()
+        self.__pending: dict[IArgumentGroup, list[_PArgTuple]] = {}
+        self.__instances: dict[IArgumentGroup, object] = {}
+        self.__from_config: set[IArgument[Any]] = set()
+        self.__groups: tuple[IArgumentGroup, ...] = ()
+
+        self.__base: "ParseResult | None" = None
+        self.__config_path: Path | str | None = None
+        self.__config_args: dict[IArgument[Any], tuple[str, ...]] = {}
+        self.__resources: list[Any] = []
+        self.__deadline: float | None = None
+        self.__timings: dict[IArgument[Any], float] = {}
+
+    @classmethod
+    def current(cls) -> "ParseResult":
+        if (result := cls.__current.get()) is not None:
+            return result
+
+        if (result := ParseResult.__latest) is None:
+            result = ParseResult.__latest = ParseResult()
+
+        return result
+
+    def bind_context(self) -> contextvars.Token["ParseResult | None"]:
+        """Bind this result to the current context until it is replaced."""
+        ParseResult.__latest = self
+        return ParseResult.__current.set(self)
+
+    @contextlib.contextmanager
+    def bind(self) -> Generator["ParseResult", None, None]:
+        """Bind this result to the current context for the duration of a with block."""
+        token = ParseResult.__current.set(self)
+        try:
+            yield self
+        finally:
+            ParseResult.__current.reset(token)
+
+    def get(self, arg: IArgument[Any], default: Any = null()) -> Any:
+        try:
+            return self.__values[arg]
+        except KeyError:
+            pass
+
+        value = default() if callable(default) else default
+        return self.__values.setdefault(arg, value)
+
+    def peek(self, arg: IArgument[Any]) -> Any:
+        return self.__values.get(arg, null())
+
+    def set(self, arg: IArgument[Any], value: Any, from_config: bool = False) -> None:
+        self.__values[arg] = value
+        self.__resolved.add(arg)
+
+        if from_config:
+            self.__from_config.add(arg)
+        else:
+            self.__from_config.discard(arg)
+
+    def items(self) -> list[tuple[IArgument[Any], Any]]:
+        """The resolved args and their values."""
+        return [(arg, self.__values[arg]) for arg in self.__resolved]
+
+    def is_resolved(self, arg: IArgument[Any]) -> bool:
+        return arg in self.__resolved
+
+    def is_from_config(self, arg: IArgument[Any]) -> bool:
+        return arg in self.__from_config
+
+    def copy(self) -> "ParseResult":
+        """A new result with the same values that shares this result's group
+        instances. The resources stay owned by this result."""
+
+        result = ParseResult()
+        result.__values = self.__values.copy()
+        result.__resolved = self.__resolved.copy()
+        result.__from_config = self.__from_config.copy()
+        result.__instances = self.__instances
+        result.__groups = self.__groups
+        result.__base = self.__base
+        result.__config_path = self.__config_path
+        result.__config_args = self.__config_args.copy()
+        return result
+
+    def replace(self, result: "ParseResult") -> None:
+        """Swap in the values of `result`. Readers see either the old or the new
+        values, never a mix of both.
+
+        The resources of `result` are moved to this result, and the ones held
+        only by replaced values are closed."""
+
+        kept = _reachable(result.__values.values())
+        stale = [i for i in self.__resources if id(i) not in kept]
+        resources = [i for i in self.__resources if id(i) in kept]
+
+        self.__values = result.__values
+        self.__resolved = result.__resolved
+        self.__from_config = result.__from_config
+        self.__config_args = result.__config_args
+
+        self.__resources = resources + result.__resources
+        result.__resources = []
+        _close(stale)
+
+    def set_config(
+        self,
+        base: "ParseResult",
+        path: Path | str,
+        config_args: dict[IArgument[Any], tuple[str, ...]],
+    ) -> None:
+        """Record the config a result was resolved from. `base` is the result as
+        it was before the config was applied."""
+
+        self.__base = base
+        self.__config_path = path
+        self.__config_args = config_args
+
+    def set_groups(self, groups: list[IArgumentGroup]) -> None:
+        """Record the groups named on the command line, in order."""
+        self.__groups = tuple(groups)
+
+    @property
+    def groups(self) -> tuple[IArgumentGroup, ...]:
+        return self.__groups
+
+    @property
+    def base(self) -> "ParseResult | None":
+        return self.__base
+
+    @property
+    def config_path(self) -> Path | str | None:
+        return self.__config_path
+
+    @property
+    def config_args(self) -> dict[IArgument[Any], tuple[str, ...]]:
+        return self.__config_args
+
+    def pending(self, arg_group: IArgumentGroup) -> list[_PArgTuple]:
+        return self.__pending.setdefault(arg_group, [])
+
+    def clear_pending(self, arg_group: IArgumentGroup) -> None:
+        self.__pending.pop(arg_group, None)
+
+    def group_instance(
+        self, arg_group: IArgumentGroup, factory: Callable[[], object]
+    ) -> object:
+        if (instance := self.__instances.get(arg_group)) is None:
+            instance = self.__instances[arg_group] = factory()
+
+        return instance
+
+    def set_deadline(self, seconds: float | None) -> None:
+        """Give the parse functions `seconds` in total from now, or no limit."""
+        self.__deadline = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> float | None:
+        """Seconds left until the deadline, or None without one."""
+        if self.__deadline is None:
+            return None
+        return self.__deadline - time.monotonic()
+
+    def record_time(self, arg: IArgument[Any], seconds: float) -> None:
+        self.__timings[arg] = self.__timings.get(arg, 0.0) + seconds
+
+    def timings(self) -> list[tuple[IArgument[Any], float]]:
+        """Time spent in the parse function of every arg, most first."""
+        return sorted(self.__timings.items(), key=lambda x: x[1], reverse=True)
+
+    def own(self, resource: Any) -> None:
+        """Close `resource` (anything with a `close` method, like the mmap of a
+        `MappedFile`) when this result is closed."""
+        self.__resources.append(resource)
+
+    def close(self) -> None:
+        """Close the resources owned by this result, newest first. Values that
+        hold them must not be used afterwards."""
+
+        _close(self.__resources)
+
+    def __enter__(self) -> "ParseResult":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"{ParseResult.__name__}(values={len(self.__values)}, resolved={len(self.__resolved)})"
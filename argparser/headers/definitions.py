@@ -11,6 +11,7 @@ class IGroupConfig(typing.Protocol):
         name: str | None = None,
         required: bool = False,
         usage_example: str | None = None,
+        allow_abbrev: bool = False,
     ) -> None: ...
     @property
     def required(self) -> bool: ...
@@ -22,6 +23,8 @@ class IGroupConfig(typing.Protocol):
     def name(self, name: str) -> None: ...
     @property
     def usage_example(self) -> str | None: ...
+    @property
+    def allow_abbrev(self) -> bool: ...
 
 
 class IArgument[T](typing.Protocol):
@@ -37,10 +40,22 @@ class IArgument[T](typing.Protocol):
         kwargs: dict[str, typing.Any] | None = None,
         re_set: HandleReSet = "rs",
         resolution_order: int | None = None,
+        cache: bool | typing.Literal["paths"] = False,
+        remainder: bool = False,
+        accumulate: bool = False,
+        timeout: float | None = None,
+        stream: bool = False,
     ) -> None: ...
     def resolve(self) -> None: ...
     def parse(
-        self, group_parent: typing.Any, args: list[str], from_config: bool
+        self,
+        group_parent: typing.Any,
+        args: list[str],
+        from_config: bool,
+        occurrences: int = 1,
+    ) -> None: ...
+    def check(
+        self, args: list[str], from_config: bool, occurrences: int = 1
     ) -> None: ...
     @property
     def named(self) -> tuple[int | None, str | None, tuple[str, ...]]: ...
@@ -51,6 +66,10 @@ class IArgument[T](typing.Protocol):
     @property
     def is_flag(self) -> bool: ...
     @property
+    def is_remainder(self) -> bool: ...
+    @property
+    def accumulates(self) -> bool: ...
+    @property
     def consumes(self) -> tuple[int, int | typing.Literal["+"]]: ...
     @property
     def parse_func_type(self) -> FuncType: ...
@@ -75,14 +94,23 @@ class IArgumentGroup(typing.Protocol):
 
     def group_name_matches(self, name: str) -> bool: ...
     def get_arg_by_name(self, name: str) -> IArgument[typing.Any]: ...
+    def get_alias_cluster(
+        self, cluster: str
+    ) -> tuple[list[IArgument[typing.Any]], str]: ...
+    def suggest(self, name: str, k: int = 3, budget: float = 0.005) -> list[str]: ...
     def set_args(
         self, *argument_tuple: tuple[IArgument[typing.Any], *tuple[str, ...]]
     ) -> None: ...
+    def pending_args(
+        self,
+    ) -> list[tuple[IArgument[typing.Any], list[str], int]]: ...
     def clear(self) -> None: ...
     def resolve(self, from_config: bool) -> None: ...
     @property
     def positional_args(self) -> tuple[IArgument[typing.Any], ...]: ...
     @property
+    def remainder_arg(self) -> IArgument[typing.Any] | None: ...
+    @property
     def config(self) -> IGroupConfig: ...
     @property
     def ordered_arguments(self) -> list[IArgument[typing.Any]]: ...
@@ -94,6 +122,7 @@ class IGroupLookup(typing.Protocol):
     def __init__(self) -> None: ...
     def add_group(self, arg_group: IArgumentGroup) -> None: ...
     def get_group(self, p_name: str) -> IArgumentGroup | None: ...
+    def suggest(self, p_name: str, k: int = 3, budget: float = 0.005) -> list[str]: ...
     def set_root_group(self, arg_group: IArgumentGroup, prog: str | None) -> None: ...
     def get_root_group(self) -> IArgumentGroup: ...
     @property
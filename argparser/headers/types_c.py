@@ -1,8 +1,7 @@
-import types
 import typing
 from dataclasses import dataclass, field
 from enum import IntEnum, StrEnum, unique
-from typing import Any, Callable, Literal, NamedTuple
+from typing import Any, Callable, Literal, NamedTuple, Sequence
 
 __all__ = [
     "null",
@@ -14,6 +13,7 @@ __all__ = [
     "CONSTANTS",
     "HandleReSet",
     "mut_wrap",
+    "bulk",
 ]
 
 
@@ -23,6 +23,7 @@ type HandleReSet = Literal["t", "s", "r", "ts", "tr", "sr", "st", "rt", "rs"]
 class CONSTANTS:
     HELP = ("-h", "--help")
     CONFIG = ("-c", "--config")
+    END_OF_OPTIONS = "--"
 
 
 class _null_meta(type):
@@ -44,7 +45,7 @@ class MatchArgRegex(StrEnum):
     VALIDATE_PARSER = r"^:?\w[\w\d-]*[\w\d]$"
 
     MATCH_ALIAS = r"^-[a-zA-Z]$"
-    MATCH_ALIASES = r"^-[a-zA-Z]+$"
+    MATCH_ALIASES = r"^-[a-zA-Z].+$"
     MATCH_NAME = r"^--\w[\w\d-]*[\w\d](?==|$)"
     MATCH_PARSER = r"^:\w[\w\d-]*[\w\d]$"
 
@@ -61,21 +62,18 @@ class Parameter:
     annotation: Any
     default: Any
     accepts_star: bool = False
+    bulk_caster: Callable[[Sequence[str]], Any] | None = None
+    packed: bool = False
     constraints: tuple[Any] | None = field(init=False)
-    caster: type | None = field(init=False)
+    caster: Callable[[str], Any] | None = field(init=False)
 
     def __post_init__(self) -> None:
         self.constraints = None
         self.caster = None
 
-        annotation_origin = typing.get_origin(self.annotation)
-
-        if annotation_origin is Literal:
+        # Casters come from the converter registry, see `utils.get_caster`
+        if not self.packed and typing.get_origin(self.annotation) is Literal:
             self.constraints = typing.get_args(self.annotation)
-        elif annotation_origin is types.UnionType:
-            self.annotation = typing.get_args(self.annotation)
-        else:
-            self.caster = self.annotation
 
 
 class FuncSignature(NamedTuple):
@@ -100,6 +98,26 @@ class mut_wrap[T]:
         self.__o = o
 
 
+class bulk[T]:
+    """Wraps a caster that receives every token of an argument in a single call.
+
+    Can be passed as `d_type` to cast a whole token sequence at once instead of
+    calling the caster on each token."""
+
+    def __init__(self, func: Callable[[Sequence[str]], Sequence[T]], /) -> None:
+        self.__func = func
+
+    @property
+    def __name__(self) -> str:
+        return getattr(self.__func, "__name__", type(self.__func).__name__)
+
+    def __call__(self, tokens: Sequence[str], /) -> Sequence[T]:
+        return self.__func(tokens)
+
+    def __repr__(self) -> str:
+        return f"{bulk.__name__}({self.__name__})"
+
+
 class callback[T]:
     def __init__(self, name: str, get_func: Callable[[], T | null]) -> None:
         self.__name = name
@@ -1,3 +1,25 @@
-from .types_c import callback, mut_wrap, null
+from ..utils.casters import register_caster
+from ..utils.constraints import OneOf, Range, Regex
+from ..utils.mapped import MappedFile, MappedFileType
+from ..utils.paths import DirPath, ExistingPath, FilePath, GlobPath, PathType
+from ..utils.ranges import IntervalSet
+from .types_c import bulk, callback, mut_wrap, null
 
-__all__ = ["null", "callback", "mut_wrap"]
+__all__ = [
+    "null",
+    "callback",
+    "mut_wrap",
+    "bulk",
+    "PathType",
+    "ExistingPath",
+    "FilePath",
+    "DirPath",
+    "GlobPath",
+    "Regex",
+    "Range",
+    "OneOf",
+    "IntervalSet",
+    "MappedFile",
+    "MappedFileType",
+    "register_caster",
+]
@@ -1 +1,6 @@
+from .check import *
+from .events import *
 from .parsing import *
+from .shell import *
+from .watch import *
+from .snapshot import *
@@ -0,0 +1,121 @@
+import shlex
+from typing import Any
+
+from .. import utils
+from ..classes import ParseResult
+from ..headers.definitions import IArgument, IArgumentGroup
+from ..headers.exceptions import ArgParserError
+from .config import read_config
+from .parsing import _CONFIG_KWARGS  # pyright: ignore[reportPrivateUsage]
+from .parsing import _builtin_args  # pyright: ignore[reportPrivateUsage]
+from .parsing import _HelpRequested  # pyright: ignore[reportPrivateUsage]
+from .parsing import _parse_args  # pyright: ignore[reportPrivateUsage]
+from .parsing import _partition_args  # pyright: ignore[reportPrivateUsage]
+
+__all__ = ["check"]
+
+
+def _check_pass(
+    argv: list[str],
+    from_config: bool,
+    errors: list[str],
+    checked: set[IArgumentGroup],
+    prefix: str = "",
+) -> list[str] | None:
+    """Check one pass (the command line or a config). Returns the tokens given
+    to -c/--config, if any."""
+
+    help_arg, config_arg = _builtin_args()
+    unused: list[tuple[IArgumentGroup, list[str]]] = []
+
+    try:
+        arg_list = _partition_args(argv, help_arg, config_arg, dry_run=True)
+        a_group_list = _parse_args(arg_list, unused)
+    except ArgParserError as e:
+        errors.append(f"{prefix}{e}")
+        return None
+
+    for arg_group, tokens in unused:
+        errors.append(
+            f"{prefix}Unexpected positional values {tokens} in argument group "
+            + f"{arg_group.config.name!r}"
+        )
+
+    conf_tokens: list[str] | None = None
+    failed: set[IArgument[Any]] = set()
+    for arg_group in a_group_list:
+        for arg_obj, arg_strs, occurrences in arg_group.pending_args():
+            if arg_obj is config_arg:
+                conf_tokens = arg_strs
+            try:
+                arg_obj.check(arg_strs, from_config, occurrences)
+            except Exception as e:
+                # User casters may raise anything
+                errors.append(f"{prefix}{arg_obj.sort_key}: {e}")
+                failed.add(arg_obj)
+
+        arg_group.clear()
+
+    for arg_group in a_group_list:
+        if arg_group in checked:
+            continue
+        checked.add(arg_group)
+
+        for arg_obj in arg_group.ordered_arguments:
+            if arg_obj in failed:
+                continue
+            try:
+                arg_obj.resolve()
+            except ArgParserError as e:
+                errors.append(f"{prefix}{e}")
+
+    return conf_tokens
+
+
+def check(argv: str | list[str]) -> list[str]:
+    """Validate a command line against the registered groups without running it.
+
+    Groups and args are looked up, values are counted, cast and checked against
+    their constraints, and required args are checked, like `resolve` does. A
+    config given with -c is read and checked the same way. Parse functions,
+    callable defaults and group constructors are never called, and help is not
+    printed (a command asking for help is valid).
+
+    Returns a message for every error found, so an empty list means the command
+    line is valid. An unknown group or argument name ends the check of that
+    command line (or config), since the tokens after it can't be attributed."""
+
+    if isinstance(argv, str):
+        argv = shlex.split(argv, comments=True)
+
+    errors: list[str] = []
+    checked: set[IArgumentGroup] = set()
+
+    result = ParseResult()
+    with result.bind(), result:
+        try:
+            conf_tokens = _check_pass(argv, False, errors, checked)
+            if conf_tokens is None:
+                return errors
+
+            # -c without a path reads the config next to the script, like resolve
+            name = (
+                conf_tokens[0]
+                if conf_tokens
+                else _CONFIG_KWARGS["config_name"] + _CONFIG_KWARGS["config_ext"]
+            )
+            try:
+                conf_argv = read_config(
+                    utils.config_func(
+                        *map(utils.config_source, conf_tokens[:1]), **_CONFIG_KWARGS
+                    )
+                )
+            except (ArgParserError, OSError, ValueError) as e:
+                errors.append(f"config {name}: {e}")
+                return errors
+
+            _check_pass(conf_argv, True, errors, checked, f"config {name}: ")
+        except _HelpRequested:
+            pass
+
+    return errors
@@ -0,0 +1,249 @@
+import hashlib
+import json
+import os
+import urllib.parse
+from pathlib import Path
+from typing import Any
+
+from .. import utils
+from ..headers.exceptions import ParsingError
+from . import profiles, remote
+
+__all__ = [
+    "read_config",
+    "read_config_dict",
+    "config_files",
+    "file_stamps",
+    "is_current",
+]
+
+# Keys of a config file that name other config files. Paths are relative to the
+# file (or URL) they appear in and may select a profile with "#name". "extends"
+# layers sit below the file, "include" layers are applied on top of it.
+_EXTENDS = "extends"
+_INCLUDE = "include"
+
+# (path, st_mtime_ns, st_size) for every file in a layer stack. For a URL it is
+# the stat of the local copy, which only changes when the server sends a new body.
+type _Stamp = tuple[str, int, int]
+
+# A config file path, or an http(s) URL
+type ConfigSource = Path | str
+
+_merged_cache: dict[str, tuple[list[_Stamp], list[str]]] = {}
+
+
+def read_config_dict(d: dict[str, Any]) -> list[str]:
+    output: list[str] = []
+    groups: list[tuple[str, dict[str, Any]]] = []
+
+    for k, v in d.items():
+        if isinstance(v, list):
+            output.append(f"--{k}")
+            output.extend(map(str, v))  # pyright: ignore[reportUnknownArgumentType]
+        elif isinstance(v, dict):
+            groups.append((k, v))  # pyright: ignore[reportUnknownArgumentType]
+        elif v is None:
+            output.append(f"--{k}")
+        else:
+            output.extend((f"--{k}", str(v)))
+
+    # Group args come last so options of the enclosing group are not read as
+    # options of a nested group.
+    for k, v in groups:
+        output.append(f":{k}")
+        output.extend(read_config_dict(v))
+
+    return output
+
+
+def _as_list(value: Any, path: str, key: str) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list) and all(isinstance(i, str) for i in value):
+        return value  # pyright: ignore[reportUnknownVariableType]
+
+    raise ParsingError(f"{key!r} in config {path!r} must be a path or list of paths")
+
+
+def _deep_merge(base: dict[str, Any], layer: dict[str, Any]) -> None:
+    for k, v in layer.items():
+        if isinstance(v, dict) and isinstance(base.get(k), dict):
+            _deep_merge(base[k], v)  # pyright: ignore[reportUnknownArgumentType]
+        elif isinstance(v, dict):
+            base[k] = {}
+            _deep_merge(base[k], v)  # pyright: ignore[reportUnknownArgumentType]
+        else:
+            base[k] = v
+
+
+def _key(source: ConfigSource) -> str:
+    if isinstance(source, str) and utils.is_url(source):
+        return source
+
+    file, profile = utils.split_profile(str(source))
+    key = str(Path(file).resolve())
+    return key if profile is None else f"{key}#{profile}"
+
+
+def _layer_key(parent: str, layer: str) -> str:
+    # "#name" names another profile of the same file
+    if layer.startswith("#"):
+        return utils.split_profile(parent)[0] + layer
+    if utils.is_url(parent) or utils.is_url(layer):
+        return urllib.parse.urljoin(parent, layer)
+    return str(Path(parent).parent.joinpath(layer).resolve())
+
+
+def _load_layers(
+    key: str, stack: tuple[str, ...], stamps: list[_Stamp]
+) -> dict[str, Any]:
+    if key in stack:
+        chain = " -> ".join((*stack, key))
+        raise ParsingError(f"Config files include each other: {chain}")
+
+    local = _local(key)
+
+    # Stamped before reading, so a change made while reading invalidates the cache
+    if stamp := _stat(key, local):
+        stamps.append(stamp)
+
+    if (profile := utils.split_profile(key)[1]) is not None:
+        contents = profiles.read_profile(local, profile)
+    else:
+        with open(local, "r") as stream:
+            contents = json.loads(stream.read())
+
+    if not isinstance(contents, dict):
+        raise ParsingError(f"Config {key!r} must contain a JSON object")
+
+    stack = (*stack, key)
+
+    extends = _as_list(contents.pop(_EXTENDS, None), key, _EXTENDS)
+    includes = _as_list(contents.pop(_INCLUDE, None), key, _INCLUDE)
+
+    merged: dict[str, Any] = {}
+    for layer_path in extends:
+        layer = _load_layers(_layer_key(key, layer_path), stack, stamps)
+        _deep_merge(merged, layer)
+
+    _deep_merge(merged, contents)  # pyright: ignore[reportUnknownArgumentType]
+
+    for layer_path in includes:
+        layer = _load_layers(_layer_key(key, layer_path), stack, stamps)
+        _deep_merge(merged, layer)
+
+    return merged
+
+
+def _stat(key: str, local: str) -> _Stamp | None:
+    try:
+        st = os.stat(local)
+    except OSError:
+        return None
+
+    return key, st.st_mtime_ns, st.st_size
+
+
+def _local(key: str) -> str:
+    """The local file of a config key, without the profile. A URL is fetched."""
+
+    file = utils.split_profile(key)[0]
+    return str(remote.fetch(file)) if utils.is_url(file) else file
+
+
+def _stamp(key: str) -> _Stamp | None:
+    # Revalidates the local copy of a URL, a single 304 if it didn't change
+    try:
+        return _stat(key, _local(key))
+    except ParsingError:
+        return None
+
+
+def _is_current(stamps: list[_Stamp]) -> bool:
+    return all(_stamp(stamp[0]) == stamp for stamp in stamps)
+
+
+def config_files(path: ConfigSource) -> list[str]:
+    """The files (and URLs) in the layer stack of `path` as of the last time it
+    was read."""
+
+    if (cached := _merged_cache.get(key := _key(path))) is None:
+        return [key]
+
+    return [stamp[0] for stamp in cached[0]]
+
+
+def file_stamps(files: list[str]) -> list[_Stamp | None]:
+    return list(map(_stamp, files))
+
+
+def is_current(path: ConfigSource) -> bool:
+    """Whether none of the files in the layer stack of `path` changed since it
+    was last read."""
+
+    if (cached := _merged_cache.get(_key(path))) is None:
+        return False
+
+    return _is_current(cached[0])
+
+
+def _disk_cache_path(key: str) -> Path | None:
+    if (directory := utils.cache_subdir("config")) is None:
+        return None
+
+    return directory.joinpath(f"{hashlib.sha1(key.encode()).hexdigest()}.json")
+
+
+def _read_disk_cache(key: str) -> tuple[list[_Stamp], list[str]] | None:
+    if (cache_path := _disk_cache_path(key)) is None:
+        return None
+
+    try:
+        with open(cache_path, "r") as stream:
+            cached = json.loads(stream.read())
+        stamps: list[_Stamp] = [tuple(i) for i in cached["files"]]  # type: ignore
+        return stamps, cached["args"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_disk_cache(key: str, stamps: list[_Stamp], args: list[str]) -> None:
+    if (cache_path := _disk_cache_path(key)) is None:
+        return None
+
+    utils.atomic_write(cache_path, json.dumps({"files": stamps, "args": args}))
+
+
+def read_config(path: ConfigSource) -> list[str]:
+    """Read a config file and the layers it extends or includes into a list of
+    args. `path` may be an http(s) URL, see `remote.fetch`, and may end in
+    `#name` to read only the profile `name`, see `profiles.read_profile`.
+
+    The merged args are cached in memory and on disk, keyed by the mtimes and
+    sizes of every file in the layer stack, so an unchanged stack is neither
+    re-read nor re-merged."""
+
+    key = _key(path)
+
+    # Every check stats the stack (a conditional request for URLs), so each
+    # cached stack is checked at most once
+    stale = _merged_cache.get(key)
+    if stale is not None and _is_current(stale[0]):
+        return list(stale[1])
+
+    cached = _read_disk_cache(key)
+    if cached is not None and (stale is None or cached[0] != stale[0]):
+        if _is_current(cached[0]):
+            _merged_cache[key] = cached
+            return list(cached[1])
+
+    stamps: list[_Stamp] = []
+    args = read_config_dict(_load_layers(key, (), stamps))
+
+    _merged_cache[key] = (stamps, args)
+    _write_disk_cache(key, stamps, args)
+
+    return list(args)
@@ -0,0 +1,177 @@
+from typing import Any, Generator, Iterable, NamedTuple
+
+from ..classes import GroupLookup
+from ..headers.definitions import IArgument, IArgumentGroup
+from ..headers.exceptions import ParsingError
+from ..headers.types_c import CONSTANTS, MatchArgRegex
+from .parsing import _builtin_args  # pyright: ignore[reportPrivateUsage]
+from .parsing import _matches  # pyright: ignore[reportPrivateUsage]
+
+__all__ = [
+    "GroupEntered",
+    "OptionMatched",
+    "ValueToken",
+    "PositionalAssigned",
+    "End",
+    "ParseEvent",
+    "iter_events",
+]
+
+
+class GroupEntered(NamedTuple):
+    """A group was named. The root group is entered first, with no token."""
+
+    index: int
+    token: str | None
+    group: IArgumentGroup
+
+
+class OptionMatched(NamedTuple):
+    """A name or alias matched an argument. A cluster of aliases (`-vn`) gives
+    one event per argument, all with the same token."""
+
+    index: int
+    token: str
+    arg: IArgument[Any]
+
+
+class ValueToken(NamedTuple):
+    """A value given to the last matched option. `token` is only the value part
+    of a token with an attached value (`-n4`)."""
+
+    index: int
+    token: str
+    arg: IArgument[Any]
+
+
+class PositionalAssigned(NamedTuple):
+    """A positional value (or a value after `--`) and the arg that takes it:
+    the group's remainder arg or one of its positional args. `arg` is None if no
+    arg takes it, in which case `resolve` ignores the value."""
+
+    index: int
+    token: str
+    arg: IArgument[Any] | None
+
+
+class End(NamedTuple):
+    """The tokens ran out. `tokens` is how many there were."""
+
+    tokens: int
+
+
+type ParseEvent = GroupEntered | OptionMatched | ValueToken | PositionalAssigned | End
+
+
+class _Positionals:
+    """Hands out the positional args of a group to values, in order."""
+
+    def __init__(self, arg_group: IArgumentGroup) -> None:
+        self.__args = arg_group.positional_args
+        self.__index: int = 0
+        self.__taken: int = 0
+
+    def assign(self) -> IArgument[Any] | None:
+        while self.__index < len(self.__args):
+            arg = self.__args[self.__index]
+            if (_max := arg.consumes[1]) == "+" or self.__taken < _max:
+                self.__taken += 1
+                return arg
+            self.__index += 1
+            self.__taken = 0
+
+        return None
+
+
+def iter_events(argv: Iterable[str]) -> Generator[ParseEvent, None, None]:
+    """Classify `argv` token by token, like `resolve` does, without parsing any
+    values or calling anything.
+
+    `argv` may be any iterable, including an unbounded stream: tokens are read
+    one at a time and nothing is kept but the current group and option. Unknown
+    group or argument names raise a `ParsingError` when they are reached.
+    Asking for help is reported as the help option and doesn't print it."""
+
+    help_arg, config_arg = _builtin_args()
+    group_lookup = GroupLookup()
+
+    root_group = group_lookup.get_root_group()
+    current_group: IArgumentGroup = root_group
+    positionals = _Positionals(current_group)
+    yield GroupEntered(-1, None, current_group)
+
+    # The option values go to, and how many of the next tokens it takes as is
+    current_arg: IArgument[Any] | None = None
+    to_consume: int = 0
+
+    index: int = -1
+    tokens = iter(argv)
+    for index, arg_str in enumerate(tokens):
+        if to_consume > 0:
+            to_consume -= 1
+            yield ValueToken(index, arg_str, current_arg)  # type: ignore
+            continue
+
+        if arg_str == CONSTANTS.END_OF_OPTIONS:
+            remainder_arg = current_group.remainder_arg
+            if remainder_arg is None and not current_group.positional_args:
+                raise ParsingError(
+                    f"No argument in argument group {current_group.config.name!r} "
+                    + f"takes the values after '--'"
+                )
+            for index, arg_str in enumerate(tokens, start=index + 1):
+                yield PositionalAssigned(
+                    index, arg_str, remainder_arg or positionals.assign()
+                )
+            break
+
+        arg_obj_name, match_type = _matches(arg=arg_str) or ("", None)
+
+        if match_type is None:
+            if current_arg is None:
+                yield PositionalAssigned(index, arg_str, positionals.assign())
+            else:
+                yield ValueToken(index, arg_str, current_arg)
+            continue
+
+        if match_type == MatchArgRegex.MATCH_PARSER:
+            if (arg_group := group_lookup.get_group(arg_obj_name)) is None:
+                error = f"{arg_obj_name} not a group name"
+                if suggestions := group_lookup.suggest(arg_obj_name):
+                    error += f". Did you mean: {', '.join(suggestions)}?"
+                raise ParsingError(error)
+
+            current_group, current_arg = arg_group, None
+            positionals = _Positionals(current_group)
+            yield GroupEntered(index, arg_str, current_group)
+            continue
+
+        attached: str = ""
+        if arg_obj_name in CONSTANTS.HELP:
+            arg_objs = [help_arg]
+        elif arg_obj_name in CONSTANTS.CONFIG and current_group is root_group:
+            arg_objs = [config_arg]
+        elif match_type == MatchArgRegex.MATCH_ALIASES:
+            arg_objs, attached = current_group.get_alias_cluster(arg_obj_name)
+        else:
+            arg_objs = [current_group.get_arg_by_name(arg_obj_name)]
+            if match_type == MatchArgRegex.MATCH_NAME and arg_obj_name != arg_str:
+                attached = arg_str[len(arg_obj_name) :]
+
+        for arg_obj in arg_objs:
+            yield OptionMatched(index, arg_str, arg_obj)
+
+        current_arg = arg_objs[-1]
+        if current_arg.is_flag:
+            to_consume = 0
+            continue
+
+        to_consume = current_arg.consumes[0]
+        if attached:
+            yield ValueToken(index, attached, current_arg)
+            # A name with an attached value takes no more tokens as is
+            to_consume = (
+                0 if match_type == MatchArgRegex.MATCH_NAME else max(to_consume - 1, 0)
+            )
+
+    yield End(index + 1)
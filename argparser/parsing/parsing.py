@@ -1,37 +1,60 @@
-import json
+import functools
+import importlib
 import re
 import typing
 from pathlib import Path
 from typing import Any
 
 from .. import formatter, utils
-from ..classes import ArgumentGroup, GroupConfig, GroupLookup, argument
+from ..classes import (
+    ArgumentGroup,
+    GroupConfig,
+    GroupLookup,
+    LazyArgumentGroup,
+    ParseResult,
+    argument,
+)
 from ..headers.definitions import IArgument, IArgumentGroup, IGroupConfig
-from ..headers.exceptions import ParsingError
+from ..headers.exceptions import ArgumentError, ParsingError
 from ..headers.types_c import CONSTANTS, MatchArgRegex
+from .config import read_config
 
-type _ArgList = list[IArgumentGroup | IArgument[Any] | str]
+type _ArgList = list[IArgumentGroup | IArgument[Any] | str | _Tail]
 type _ArgTuple = tuple[IArgument[Any] | None, *tuple[str, ...]]
 type _PArgTuple = tuple[IArgument[Any], *tuple[str, ...]]
 
-__all__ = ["resolve", "add_group", "set_root_group"]
+__all__ = ["resolve", "reload_config", "add_group", "set_root_group"]
 
 
-def _matches(arg: str) -> tuple[str, MatchArgRegex] | None:
-    regex_list: list[MatchArgRegex] = [
+# Compiled once: re.match with an enum member hashes the member (in Python)
+# to find the compiled pattern on every call
+_MATCH_REGEXES: list[tuple[re.Pattern[str], MatchArgRegex]] = [
+    (re.compile(regex), regex)
+    for regex in (
         MatchArgRegex.MATCH_PARSER,
         MatchArgRegex.MATCH_ALIAS,
         MatchArgRegex.MATCH_NAME,
         MatchArgRegex.MATCH_ALIASES,
-    ]
+    )
+]
 
-    for regex in regex_list:
-        if match := re.match(regex, arg):
+
+def _matches(arg: str) -> tuple[str, MatchArgRegex] | None:
+    # Every pattern starts with '-' or ':', so plain values skip the regexes
+    if not arg or arg[0] not in "-:":
+        return None
+
+    for pattern, regex in _MATCH_REGEXES:
+        if match := pattern.match(arg):
             return match.group(), regex
 
     return None
 
 
+class _Tail(list[str]):
+    """The tokens after `--`. They are passed on as one slice, never classified."""
+
+
 class _GetConfArg:
     def __init__(self, current_group: IArgumentGroup, conf_arg: IArgument[Any]) -> None:
         self.__conf_arg = conf_arg
@@ -45,10 +68,15 @@ class _GetConfArg:
         return self.__current_group
 
 
+class _HelpRequested(Exception):
+    """Raised instead of printing help when partitioning for a dry run."""
+
+
 def _partition_args(
     argv: list[str],
     help_arg: IArgument[Any],
     config_arg: IArgument[Any],
+    dry_run: bool = False,
 ) -> _ArgList:
     group_lookup = GroupLookup()
 
@@ -64,7 +92,21 @@ def _partition_args(
         if isinstance(current_arg_group, _GetConfArg):
             current_arg_group = current_arg_group.current_group
 
+        if arg_str == CONSTANTS.END_OF_OPTIONS:
+            if (
+                current_arg_group.remainder_arg is None
+                and not current_arg_group.positional_args
+            ):
+                raise ParsingError(
+                    f"No argument in argument group {current_arg_group.config.name!r} "
+                    + f"takes the values after '--'"
+                )
+            arg_list.append(_Tail(argv[index + 1 :]))
+            break
+
         if arg_obj_name in CONSTANTS.HELP:
+            if dry_run:
+                raise _HelpRequested
             formatter.print_help(
                 group_lookup.get_root_group(),
                 current_arg_group,
@@ -86,7 +128,10 @@ def _partition_args(
 
         elif match_type == MatchArgRegex.MATCH_PARSER:
             if (arg_group := group_lookup.get_group(arg_obj_name)) is None:
-                raise ParsingError(f"{arg_obj_name} not a group name")
+                error = f"{arg_obj_name} not a group name"
+                if suggestions := group_lookup.suggest(arg_obj_name):
+                    error += f". Did you mean: {', '.join(suggestions)}?"
+                raise ParsingError(error)
             current_arg_group = arg_group
             arg_list.append(current_arg_group)
         elif match_type == MatchArgRegex.MATCH_ALIAS:
@@ -114,34 +159,65 @@ def _partition_args(
             arg_list.extend(argv[index : index + min_consumes])
             index += min_consumes
         elif match_type == MatchArgRegex.MATCH_ALIASES:
-            for char in arg_obj_name[1:]:
-                arg_list.append(current_arg_group.get_arg_by_name(f"-{char}"))
+            arg_objs, attached = current_arg_group.get_alias_cluster(arg_obj_name)
+            arg_list.extend(arg_objs)
+
+            arg_obj = arg_objs[-1]
+            if arg_obj.is_flag:
+                continue
+
+            min_consumes = arg_obj.consumes[0]
+            if attached:
+                arg_list.append(attached)
+                min_consumes -= 1
+
+            if min_consumes > 0:
+                arg_list.extend(argv[index : index + min_consumes])
+                index += min_consumes
 
     return arg_list
 
 
-def _parse_args(arg_list: _ArgList) -> list[IArgumentGroup]:
+def _parse_args(
+    arg_list: _ArgList, unused: list[tuple[IArgumentGroup, list[str]]] | None = None
+) -> list[IArgumentGroup]:
+    """Split `arg_list` into the pending args of each group. Positional values
+    that no positional arg takes are dropped, or appended to `unused`."""
+
     arg_group_list: list[tuple[IArgumentGroup, list[_ArgTuple]]] = []
 
     current_arg_obj_list: list[_ArgTuple] = []
     current_arg_obj: IArgument[Any] | None = None
     arg_str: list[str] = []
+    tail: tuple[IArgumentGroup, _Tail] | None = None
 
     for arg in arg_list:
-        if isinstance(arg, ArgumentGroup):
+        # Values are by far the most common, and the class checks go through the
+        # (slow) protocol isinstance
+        if isinstance(arg, str):
+            arg_str.append(arg)
+        elif isinstance(arg, argument):
+            current_arg_obj_list.append((current_arg_obj, *arg_str))
+
+            current_arg_obj = arg
+            arg_str.clear()
+        elif isinstance(arg, ArgumentGroup):
             current_arg_obj_list.append((current_arg_obj, *arg_str))
             current_arg_obj = None
             arg_str.clear()
 
             current_arg_obj_list = []
             arg_group_list.append((arg, current_arg_obj_list))
-        elif isinstance(arg, argument):
-            current_arg_obj_list.append((current_arg_obj, *arg_str))
-
-            current_arg_obj = arg
-            arg_str.clear()
-        elif isinstance(arg, str):
-            arg_str.append(arg)
+        elif isinstance(arg, _Tail):
+            # Always last. Goes to the remainder arg, otherwise it is added to the
+            # group's positional values
+            a_group_obj = arg_group_list[-1][0]
+            if (remainder_arg := a_group_obj.remainder_arg) is not None:
+                current_arg_obj_list.append((current_arg_obj, *arg_str))
+                current_arg_obj = remainder_arg
+                arg_str = arg
+            else:
+                tail = (a_group_obj, arg)
 
     current_arg_obj_list.append((current_arg_obj, *arg_str))
     del arg_str
@@ -151,6 +227,8 @@ def _parse_args(arg_list: _ArgList) -> list[IArgumentGroup]:
             continue
 
         arg_str_tuple = arg_tup_list.pop(0)[1:]
+        if tail is not None and tail[0] is a_group_obj:
+            arg_str_tuple += tuple(tail[1])
 
         if not arg_str_tuple:
             continue
@@ -167,6 +245,9 @@ def _parse_args(arg_list: _ArgList) -> list[IArgumentGroup]:
 
             if index >= len(arg_str_tuple):
                 break
+        else:
+            if unused is not None and index < len(arg_str_tuple):
+                unused.append((a_group_obj, list(arg_str_tuple[index:])))
 
     for a_group_obj, arg_tup_list in arg_group_list:
         a_group_obj.set_args(*typing.cast(list[_PArgTuple], arg_tup_list))
@@ -206,20 +287,84 @@ def _new_arg_group(
     )
 
 
+def _import_group(path: str) -> type:
+    module_name, _, attr_path = path.partition(":")
+
+    obj: Any = importlib.import_module(module_name)
+    for attr in attr_path.split("."):
+        obj = getattr(obj, attr)
+
+    if not isinstance(obj, type):
+        raise ArgumentError(f"{path!r} does not name a class")
+
+    return obj
+
+
+def _new_lazy_arg_group(
+    path: str,
+    group_config: IGroupConfig | None,
+    name: str | None,
+    doc: str | None,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> IArgumentGroup:
+    module_name, sep, attr_path = path.partition(":")
+    if not (module_name and sep and attr_path):
+        raise ArgumentError(
+            f"Lazy group {path!r} must be given as 'package.module:ClassName'"
+        )
+
+    config = group_config or GroupConfig()
+    config.name = name or config.name or attr_path.split(".")[-1].lower()
+
+    def loader() -> IArgumentGroup:
+        arg_group = _new_arg_group(
+            argument_group=_import_group(path),
+            group_config=group_config,
+            args=args,
+            kwargs=kwargs,
+        )
+        # The registered name is the one users have already typed
+        arg_group.config.name = config.name or ""
+        return arg_group
+
+    return LazyArgumentGroup(config=config, doc=doc or "", loader=loader)
+
+
 def add_group(
-    argument_group: type,
+    argument_group: type | str,
     /,
     group_config: IGroupConfig | None = None,
     *,
     args: tuple[Any, ...] = (),
     kwargs: dict[str, Any] | None = None,
+    name: str | None = None,
+    doc: str | None = None,
 ) -> None:
-    arg_group = _new_arg_group(
-        argument_group=argument_group,
-        group_config=group_config,
-        args=args,
-        kwargs=kwargs or {},
-    )
+    """Register a group.
+
+    The group may be given as 'package.module:ClassName', in which case the
+    module is only imported once the group is named on the command line (or in a
+    config). `name` and `doc` are used by help until then."""
+
+    if isinstance(argument_group, str):
+        arg_group = _new_lazy_arg_group(
+            path=argument_group,
+            group_config=group_config,
+            name=name,
+            doc=doc,
+            args=args,
+            kwargs=kwargs or {},
+        )
+    else:
+        arg_group = _new_arg_group(
+            argument_group=argument_group,
+            group_config=group_config,
+            args=args,
+            kwargs=kwargs or {},
+        )
+        if name:
+            arg_group.config.name = name
 
     GroupLookup().add_group(arg_group)
 
@@ -243,34 +388,12 @@ def set_root_group(
     GroupLookup().set_root_group(arg_group, prog)
 
 
-def _read_config_dict(d: dict[str, Any]) -> list[str]:
-    output: list[str] = []
-
-    for k, v in d.items():
-        if isinstance(v, list):
-            output.append(f"--{k}")
-            output.extend(map(str, v))  # pyright: ignore[reportUnknownArgumentType]
-        elif isinstance(v, dict):
-            output.append(f":{k}")
-            output.extend(
-                _read_config_dict(v)  # pyright: ignore[reportUnknownArgumentType]
-            )
-        elif v is None:
-            output.append(f"--{k}")
-        else:
-            output.extend((f"--{k}", str(v)))
-
-    return output
-
-
-def _read_config(path: Path) -> list[str]:
-    with open(path, "r") as stream:
-        contents = json.loads(stream.read())
+# Where -c looks for a config when it's given no path
+_CONFIG_KWARGS: dict[str, Any] = {"config_name": "config", "config_ext": ".json"}
 
-    return _read_config_dict(contents)
 
-
-def resolve() -> None:
+@functools.cache
+def _builtin_args() -> tuple[IArgument[Any], IArgument[Any]]:
     def _help() -> None:
         """Display this help message and exit"""
 
@@ -280,14 +403,110 @@ def resolve() -> None:
         names="config",
         default=None,
         re_set="r",
-        d_type=Path,
-        kwargs={"config_name": "config", "config_ext": ".json"},
+        d_type=utils.config_source,
+        kwargs=_CONFIG_KWARGS,
     )(utils.config_func)
 
-    import sys
+    return help_arg, config_arg
+
+
+def _resolve_config(
+    result: ParseResult, conf_path: Path | str, previous: ParseResult | None = None
+) -> list[IArgument[Any]]:
+    """Resolve the args of a config file into `result`, which must be bound.
+
+    Args whose tokens are the same as in `previous` keep their previous value
+    instead of being parsed again. Returns the args whose tokens changed."""
+
+    help_arg, config_arg = _builtin_args()
+    base = result.copy()
 
-    arg_list = _partition_args(sys.argv[1:], help_arg, config_arg)
+    arg_list = _partition_args(read_config(conf_path), help_arg, config_arg)
     a_group_list = _parse_args(arg_list)
+
+    config_args: dict[IArgument[Any], tuple[str, ...]] = {}
+    changed: list[IArgument[Any]] = []
+
+    for i in a_group_list:
+        pending = result.pending(i)
+        to_parse: list[_PArgTuple] = []
+
+        for arg_obj, *arg_strs in pending:
+            config_args[arg_obj] = tuple(arg_strs)
+
+            unchanged = (
+                previous is not None
+                and previous.config_args.get(arg_obj) == config_args[arg_obj]
+            )
+            if unchanged and previous.is_from_config(arg_obj):  # type: ignore
+                result.set(arg_obj, previous.get(arg_obj), from_config=True)
+                continue
+
+            to_parse.append((arg_obj, *arg_strs))
+            if not unchanged:
+                changed.append(arg_obj)
+
+        pending[:] = to_parse
+
+    if previous is not None:
+        changed.extend(i for i in previous.config_args if i not in config_args)
+
+    for i in a_group_list:
+        i.resolve(True)
+        i.clear()
+
+    result.set_config(result.base or base, conf_path, config_args)
+
+    return changed
+
+
+def reload_config(result: ParseResult | None = None) -> list[IArgument[Any]]:
+    """Re-read the config `result` (defaults to the current result) was resolved
+    from and re-parse only the args whose config tokens changed.
+
+    The new values are swapped into `result` at once. Returns the changed args."""
+
+    result = result or ParseResult.current()
+
+    if (base := result.base) is None or (conf_path := result.config_path) is None:
+        return []
+
+    new_result = base.copy()
+    with new_result.bind():
+        changed = _resolve_config(new_result, conf_path, previous=result)
+
+    if changed:
+        result.replace(new_result)
+
+    return changed
+
+
+def resolve(
+    argv: list[str] | None = None, deadline: float | None = None
+) -> ParseResult:
+    """Parse `argv` (defaults to `sys.argv[1:]`) into a new `ParseResult`.
+
+    The result is bound to the current context, so values read through the
+    group classes afterwards (`Foo.bar()`) come from this parse.
+
+    With a `deadline` (in seconds) the parse functions run on a worker thread
+    and a `ParsingError` is raised once they took longer than that in total.
+    `result.timings()` reports where the time went."""
+
+    help_arg, config_arg = _builtin_args()
+
+    if argv is None:
+        import sys
+
+        argv = sys.argv[1:]
+
+    result = ParseResult()
+    result.set_deadline(deadline)
+    result.bind_context()
+
+    arg_list = _partition_args(argv, help_arg, config_arg)
+    a_group_list = _parse_args(arg_list)
+    result.set_groups(a_group_list)
     for i in a_group_list:
         i.resolve(False)
         i.clear()
@@ -295,11 +514,8 @@ def resolve() -> None:
     conf_path = config_arg.__get__(None, None.__class__)()
 
     if not conf_path:
-        return None
+        return result
 
-    arg_list = _partition_args(_read_config(conf_path), help_arg, config_arg)
-    a_group_list = _parse_args(arg_list)
+    _resolve_config(result, conf_path)
 
-    for i in a_group_list:
-        i.resolve(True)
-        i.clear()
+    return result
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any
+
+from .. import utils
+from ..headers.exceptions import ParsingError
+
+__all__ = ["read_profile"]
+
+# profile name -> (byte offset, byte length) of its value in the file
+type _Offsets = dict[str, tuple[int, int]]
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# path -> (st_size, st_mtime_ns, offsets)
+_indexes: dict[str, tuple[int, int, _Offsets]] = {}
+
+
+def _index_path(path: str) -> Path | None:
+    if (directory := utils.cache_subdir("profiles")) is None:
+        return None
+
+    return directory.joinpath(f"{hashlib.sha1(path.encode()).hexdigest()}.json")
+
+
+def _scan(path: str, data: bytes) -> _Offsets:
+    """Byte offsets of the values of a JSON object's top-level keys."""
+
+    text = data.decode()
+    decoder = json.JSONDecoder()
+
+    def skip(index: int) -> int:
+        return _WHITESPACE.match(text, index).end()  # type: ignore
+
+    def expect(index: int, chars: str) -> str:
+        if (char := text[index : index + 1]) not in chars or not char:
+            raise ParsingError(f"Config {path!r} must contain a JSON object")
+        return char
+
+    offsets: dict[str, tuple[int, int]] = {}
+
+    index = skip(0)
+    expect(index, "{")
+    index = skip(index + 1)
+    if text[index : index + 1] == "}":
+        return offsets
+
+    while True:
+        expect(index, '"')
+        key, index = json.decoder.scanstring(text, index + 1)  # type: ignore
+        index = skip(index)
+        expect(index, ":")
+        start = skip(index + 1)
+        _, end = decoder.raw_decode(text, start)
+        offsets[key] = (start, end)
+
+        index = skip(end)
+        if expect(index, ",}") == "}":
+            break
+        index = skip(index + 1)
+
+    if len(text) == len(data):
+        return {k: (start, end - start) for k, (start, end) in offsets.items()}
+
+    # Not ASCII, so character offsets have to be turned into byte offsets
+    byte_offsets: _Offsets = {}
+    char_pos = byte_pos = 0
+    for k, (start, end) in sorted(offsets.items(), key=lambda i: i[1]):
+        byte_pos += len(text[char_pos:start].encode())
+        length = len(text[start:end].encode())
+        byte_offsets[k] = (byte_pos, length)
+        char_pos, byte_pos = end, byte_pos + length
+
+    return byte_offsets
+
+
+def _read_index(path: str, st: os.stat_result) -> _Offsets | None:
+    if (cached := _indexes.get(path)) is not None:
+        if cached[:2] == (st.st_size, st.st_mtime_ns):
+            return cached[2]
+
+    if (index_path := _index_path(path)) is None:
+        return None
+
+    try:
+        with open(index_path, "r") as stream:
+            index = json.loads(stream.read())
+        if (index["size"], index["mtime_ns"]) != (st.st_size, st.st_mtime_ns):
+            return None
+        offsets: _Offsets = {k: tuple(v) for k, v in index["profiles"].items()}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    _indexes[path] = (st.st_size, st.st_mtime_ns, offsets)
+    return offsets
+
+
+def _build_index(path: str) -> _Offsets:
+    with open(path, "rb") as stream:
+        # Stat before reading, so a change made while reading invalidates the index
+        st = os.fstat(stream.fileno())
+        offsets = _scan(path, stream.read())
+
+    _indexes[path] = (st.st_size, st.st_mtime_ns, offsets)
+
+    if (index_path := _index_path(path)) is None:
+        return offsets
+
+    utils.atomic_write(
+        index_path,
+        json.dumps(
+            {
+                "path": path,
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "profiles": offsets,
+            }
+        ),
+    )
+
+    return offsets
+
+
+def _offsets(path: str) -> _Offsets:
+    if (offsets := _read_index(path, os.stat(path))) is None:
+        offsets = _build_index(path)
+
+    return offsets
+
+
+def read_profile(path: str, profile: str) -> Any:
+    """Decode only the value of the top-level key `profile` of the JSON file at
+    `path`.
+
+    The first read builds an index of the byte offsets of every top-level value,
+    kept in memory and next to the other caches on disk. It is invalidated by the
+    file's size and mtime. Later reads seek to the profile and decode only it."""
+
+    offsets = _offsets(path)
+
+    if (position := offsets.get(profile)) is None:
+        error = f"Config {path!r} has no profile {profile!r}"
+        if suggestions := utils.SuggestionIndex(offsets).suggest(profile):
+            error += f". Did you mean: {', '.join(suggestions)}?"
+        raise ParsingError(error)
+
+    offset, length = position
+    with open(path, "rb") as stream:
+        stream.seek(offset)
+        return json.loads(stream.read(length))
@@ -0,0 +1,137 @@
+import hashlib
+import http.client
+import json
+import tempfile
+import threading
+import urllib.parse
+import warnings
+from pathlib import Path
+
+from .. import utils
+from ..headers.exceptions import ParsingError
+
+__all__ = ["fetch", "close_connections"]
+
+# Seconds to wait for the config server
+TIMEOUT: float = 10.0
+
+type _HostKey = tuple[str, str, int | None]
+
+# One idle connection per host, reused by every config layer on that host
+_connections: dict[_HostKey, http.client.HTTPConnection] = {}
+_lock = threading.Lock()
+
+
+def _remote_dir() -> Path:
+    if (directory := utils.cache_subdir("remote")) is not None:
+        return directory
+
+    # Remote configs need a local copy even when caching is disabled
+    directory = Path(tempfile.gettempdir(), "argparser", "remote")
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def _connect(key: _HostKey) -> http.client.HTTPConnection:
+    scheme, host, port = key
+    if scheme == "https":
+        return http.client.HTTPSConnection(host, port, timeout=TIMEOUT)
+    return http.client.HTTPConnection(host, port, timeout=TIMEOUT)
+
+
+def _get(
+    url: str, headers: dict[str, str]
+) -> tuple[int, http.client.HTTPMessage, bytes]:
+    parts = urllib.parse.urlsplit(url)
+    key: _HostKey = (parts.scheme, parts.hostname or "", parts.port)
+    target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+    for attempt in range(2):
+        with _lock:
+            connection = _connections.pop(key, None)
+        reused = connection is not None
+        connection = connection or _connect(key)
+
+        try:
+            connection.request("GET", target, headers=headers)
+            response = connection.getresponse()
+            body = response.read()
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            # An idle connection may have been closed by the server, retry once
+            if reused and attempt == 0:
+                continue
+            raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            with _lock:
+                if (idle := _connections.pop(key, None)) is not None:
+                    idle.close()
+                _connections[key] = connection
+
+        return response.status, response.headers, body
+
+    raise AssertionError("unreachable")
+
+
+def close_connections() -> None:
+    with _lock:
+        while _connections:
+            _connections.popitem()[1].close()
+
+
+def fetch(url: str) -> Path:
+    """Download the config at `url` into a local cache and return its path.
+
+    A cached copy is revalidated with If-None-Match/If-Modified-Since, so an
+    unchanged config costs a single 304 round trip. If the server can't be
+    reached the cached copy is used (with a warning)."""
+
+    directory = _remote_dir()
+    name = hashlib.sha1(url.encode()).hexdigest()
+    body_path = directory.joinpath(f"{name}.json")
+    meta_path = directory.joinpath(f"{name}.meta")
+
+    headers = {"User-Agent": "argparser", "Accept": "application/json"}
+    try:
+        with open(meta_path, "r") as stream:
+            meta: dict[str, str] = json.loads(stream.read())
+        if body_path.exists():
+            if etag := meta.get("etag"):
+                headers["If-None-Match"] = etag
+            if last_modified := meta.get("last_modified"):
+                headers["If-Modified-Since"] = last_modified
+    except (OSError, ValueError):
+        pass
+
+    try:
+        status, response_headers, body = _get(url, headers)
+    except (http.client.HTTPException, OSError) as e:
+        if body_path.exists():
+            warnings.warn(f"Using cached config for {url!r}, fetching failed: {e}")
+            return body_path
+        raise ParsingError(f"Config {url!r} could not be fetched: {e}") from e
+
+    if status == 304 and body_path.exists():
+        return body_path
+    if status != 200:
+        raise ParsingError(f"Config {url!r} could not be fetched: HTTP {status}")
+
+    if not utils.atomic_write(body_path, body):
+        raise ParsingError(f"Config {url!r} could not be saved to {str(body_path)!r}")
+    # Stale validators must not be sent for the new body
+    if not utils.atomic_write(
+        meta_path,
+        json.dumps(
+            {
+                "url": url,
+                "etag": response_headers.get("ETag"),
+                "last_modified": response_headers.get("Last-Modified"),
+            }
+        ),
+    ):
+        meta_path.unlink(missing_ok=True)
+
+    return body_path
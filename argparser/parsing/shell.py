@@ -0,0 +1,132 @@
+import shlex
+import sys
+from pathlib import Path
+from typing import Any, Callable, Iterable, TextIO
+
+from ..classes import GroupLookup, ParseResult
+from ..headers.exceptions import ArgParserError
+from .parsing import resolve
+
+__all__ = ["Shell"]
+
+type _Handler = Callable[[ParseResult], Any]
+
+
+class Shell:
+    """Runs many commands through the registered groups in one process.
+
+    Each command is split with `shlex` and resolved into its own `ParseResult`,
+    so no state carries over between commands. The result is then passed to the
+    handler of the last group named in the command (or the default handler),
+    which runs with the result bound so `Foo.bar()` reads the command's values."""
+
+    def __init__(
+        self,
+        prompt: str = "> ",
+        stop_on_error: bool = False,
+        err: TextIO | None = None,
+    ) -> None:
+        self.__prompt = prompt
+        self.__stop_on_error = stop_on_error
+        self.__err = err
+        self.__handlers: dict[str | None, _Handler] = {}
+
+    def handler(self, group_name: str | None = None) -> Callable[[_Handler], _Handler]:
+        """Register a handler for commands that name `group_name`, or the default
+        handler if no group name is given."""
+
+        key = f":{group_name.lstrip(':')}" if group_name else None
+
+        def decorator(func: _Handler) -> _Handler:
+            self.__handlers[key] = func
+            return func
+
+        return decorator
+
+    def __dispatch(self, result: ParseResult) -> Any:
+        root_group = GroupLookup().get_root_group()
+
+        for arg_group in reversed(result.groups):
+            if arg_group is root_group:
+                continue
+            if handler := self.__handlers.get(arg_group.config.name):
+                return handler(result)
+            break
+
+        if handler := self.__handlers.get(None):
+            return handler(result)
+
+        return None
+
+    def run_command(self, argv: str | list[str]) -> Any:
+        """Resolve a single command and return what its handler returned."""
+
+        if isinstance(argv, str):
+            argv = shlex.split(argv, comments=True)
+
+        if not argv:
+            return None
+
+        try:
+            result = resolve(argv)
+        except SystemExit:
+            # -h/--help prints and exits, which must not end the shell
+            return None
+
+        # Resources owned by the result (like mapped files) live until the
+        # handler returns
+        with result.bind(), result:
+            return self.__dispatch(result)
+
+    def __report(self, line_no: int, line: str, error: Exception) -> None:
+        err = self.__err or sys.stderr
+        err.write(f"{line_no}: {line.strip()}\n    {type(error).__name__}: {error}\n")
+
+    def run_batch(self, lines: Iterable[str]) -> int:
+        """Run one command per line. Blank lines and `#` comments are skipped.
+
+        Returns the number of commands that failed."""
+
+        failures: int = 0
+        for line_no, line in enumerate(lines, start=1):
+            try:
+                self.run_command(line)
+            except (ArgParserError, ValueError, TypeError, OSError) as e:
+                failures += 1
+                self.__report(line_no, line, e)
+                if self.__stop_on_error:
+                    break
+
+        return failures
+
+    def run_file(self, path: Path | str) -> int:
+        with open(path, "r") as stream:
+            return self.run_batch(stream)
+
+    def repl(self, stdin: TextIO | None = None) -> None:
+        """Read commands until end of input. A prompt is shown when reading from
+        a terminal."""
+
+        stdin = stdin or sys.stdin
+        interactive = stdin.isatty()
+
+        line_no: int = 0
+        while True:
+            line_no += 1
+            try:
+                line = input(self.__prompt) if interactive else stdin.readline()
+            except EOFError:
+                break
+            except KeyboardInterrupt:
+                print()
+                continue
+
+            if not interactive and not line:
+                break
+
+            try:
+                self.run_command(line)
+            except (ArgParserError, ValueError, TypeError, OSError) as e:
+                self.__report(line_no, line, e)
+                if self.__stop_on_error:
+                    break
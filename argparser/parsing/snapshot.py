@@ -0,0 +1,110 @@
+import pickle
+from typing import Any, NamedTuple
+
+from ..classes import GroupLookup, LazyArgumentGroup, ParseResult
+from ..headers.definitions import IArgument, IArgumentGroup
+from ..headers.exceptions import ArgParserError, ParsingError
+from .parsing import _builtin_args  # pyright: ignore[reportPrivateUsage]
+
+__all__ = ["Snapshot", "export_state", "install_state"]
+
+# Group key of the builtin -h/-c args, the root group is keyed by None
+_BUILTIN = 0
+
+type _GroupKey = str | int | None
+
+
+class Snapshot(NamedTuple):
+    """The resolved values of a `ParseResult`, pickled once so the snapshot can
+    be passed to many worker processes cheaply.
+
+    Args are keyed by their group's name and their own name, not by identity,
+    so the snapshot can be installed in a process that imported the groups
+    itself (like a `spawn` worker)."""
+
+    payload: bytes
+
+    @property
+    def size(self) -> int:
+        return len(self.payload)
+
+
+def _group_key(arg_group: IArgumentGroup) -> _GroupKey:
+    if arg_group is GroupLookup().get_root_group():
+        return None
+    return arg_group.config.name
+
+
+def _arg_keys() -> dict[IArgument[Any], tuple[_GroupKey, str]]:
+    lookup = GroupLookup()
+    keys: dict[IArgument[Any], tuple[_GroupKey, str]] = {
+        arg: (_BUILTIN, arg.sort_key) for arg in _builtin_args()
+    }
+
+    for arg_group in (lookup.get_root_group(), *lookup.groups):
+        # Groups that were never imported can't hold values
+        if isinstance(arg_group, LazyArgumentGroup) and not arg_group.loaded:
+            continue
+
+        group_key = _group_key(arg_group)
+        for arg in arg_group.ordered_arguments:
+            keys[arg] = (group_key, arg.sort_key)
+
+    return keys
+
+
+def export_state(result: ParseResult | None = None) -> Snapshot:
+    """Snapshot the resolved values of `result` (defaults to the current result).
+
+    Only values of args that were given on the command line or in a config are
+    included: defaults are computed again where the snapshot is installed. The
+    values must be picklable. Group instances are not included."""
+
+    result = result or ParseResult.current()
+    keys = _arg_keys()
+
+    values: list[tuple[_GroupKey, str, Any, bool]] = []
+    for arg, value in result.items():
+        group_key, name = keys[arg]
+        values.append((group_key, name, value, result.is_from_config(arg)))
+
+    groups = [_group_key(i) for i in result.groups]
+
+    try:
+        payload = pickle.dumps((values, groups), protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        raise ArgParserError(f"Resolved values can't be exported: {e}") from e
+
+    return Snapshot(payload)
+
+
+def install_state(snapshot: Snapshot) -> ParseResult:
+    """Install a snapshot made by `export_state` as the current result of this
+    process. Meant to be used as (or called from) a worker initializer:
+
+    >>> Pool(initializer=install_state, initargs=(export_state(),))
+    """
+
+    lookup = GroupLookup()
+    builtins = {arg.sort_key: arg for arg in _builtin_args()}
+    values, groups = pickle.loads(snapshot.payload)
+
+    def get_group(group_key: _GroupKey) -> IArgumentGroup:
+        if group_key is None:
+            return lookup.get_root_group()
+        if (arg_group := lookup.get_group(str(group_key))) is None:
+            raise ParsingError(f"Snapshot names unknown argument group {group_key!r}")
+        return arg_group
+
+    result = ParseResult()
+    for group_key, name, value, from_config in values:
+        if group_key == _BUILTIN:
+            arg = builtins[name]
+        else:
+            arg = get_group(group_key).get_arg_by_name(name)
+        result.set(arg, value, from_config)
+
+    result.set_groups([get_group(i) for i in groups])
+    result.bind_context()
+
+    return result
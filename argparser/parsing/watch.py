@@ -0,0 +1,194 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+from .. import utils
+from ..classes import ParseResult
+from ..headers.definitions import IArgument
+from ..headers.exceptions import ArgParserError
+from .config import config_files, file_stamps, is_current
+from .parsing import reload_config
+
+__all__ = ["ConfigChange", "ConfigWatcher", "watch"]
+
+# IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_INOTIFY_MASK = 0x002 | 0x004 | 0x008 | 0x080 | 0x100 | 0x200
+
+
+class ConfigChange(NamedTuple):
+    path: Path | str
+    changed: tuple[IArgument[Any], ...]
+    error: Exception | None = None
+
+    @property
+    def names(self) -> list[str]:
+        return [arg.sort_key for arg in self.changed]
+
+
+class _Inotify:
+    """Wakes the watcher when one of the watched directories changes. Only a
+    hint: whether the config changed is always decided by comparing stats."""
+
+    def __init__(self) -> None:
+        self.__fd: int = -1
+        self.__watched: set[str] = set()
+
+        if not sys.platform.startswith("linux"):
+            return None
+
+        try:
+            self.__libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            self.__fd = self.__libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            self.__fd = -1
+
+    @property
+    def available(self) -> bool:
+        return self.__fd >= 0
+
+    def watch(self, directories: set[str]) -> None:
+        for directory in directories - self.__watched:
+            if (
+                self.__libc.inotify_add_watch(
+                    self.__fd, os.fsencode(directory), _INOTIFY_MASK
+                )
+                >= 0
+            ):
+                self.__watched.add(directory)
+
+    def wait(self, timeout: float) -> None:
+        if select.select([self.__fd], [], [], timeout)[0]:
+            try:
+                while os.read(self.__fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        if self.available:
+            os.close(self.__fd)
+            self.__fd = -1
+
+
+class ConfigWatcher:
+    """Watches the config files of a `ParseResult` and re-resolves the args whose
+    config tokens changed.
+
+    Files are checked by polling their stats every `interval` seconds. On Linux
+    inotify is used (when `use_inotify` is set) to check as soon as a file
+    changes. Subscribers are called with a `ConfigChange` after every reload,
+    including failed ones, from the thread that ran the check."""
+
+    def __init__(
+        self,
+        result: ParseResult | None = None,
+        interval: float = 1.0,
+        use_inotify: bool = True,
+    ) -> None:
+        self.__result = result or ParseResult.current()
+        self.__interval = interval
+        self.__use_inotify = use_inotify
+        self.__subscribers: list[Callable[[ConfigChange], None]] = []
+        self.__stop = threading.Event()
+        self.__thread: threading.Thread | None = None
+        self.__lock = threading.Lock()
+        self.__failed_stamps: list[Any] | None = None
+
+    def subscribe(self, func: Callable[[ConfigChange], None]) -> Callable[[], None]:
+        """Call `func` on every config change. Returns a function that
+        unsubscribes it."""
+
+        self.__subscribers.append(func)
+        return lambda: self.__subscribers.remove(func)
+
+    def __notify(self, change: ConfigChange) -> None:
+        for func in tuple(self.__subscribers):
+            func(change)
+
+    def check(self) -> ConfigChange | None:
+        """Reload the config if any of its files changed since it was read."""
+
+        if (path := self.__result.config_path) is None:
+            return None
+
+        with self.__lock:
+            if is_current(path):
+                return None
+
+            # Don't report the same broken config again until it changes
+            stamps = file_stamps(config_files(path))
+            if stamps == self.__failed_stamps:
+                return None
+
+            try:
+                change = ConfigChange(path, tuple(reload_config(self.__result)))
+                self.__failed_stamps = None
+            except (ArgParserError, OSError, ValueError) as e:
+                change = ConfigChange(path, (), e)
+                self.__failed_stamps = stamps
+
+        if change.changed or change.error:
+            self.__notify(change)
+
+        return change
+
+    def __run(self) -> None:
+        inotify = _Inotify() if self.__use_inotify else None
+
+        try:
+            while not self.__stop.is_set():
+                if inotify and inotify.available and self.__result.config_path:
+                    files = config_files(self.__result.config_path)
+                    inotify.watch(
+                        {
+                            os.path.dirname(i) or "."
+                            for i in files
+                            if not utils.is_url(i)
+                        }
+                    )
+                    inotify.wait(self.__interval)
+                else:
+                    self.__stop.wait(self.__interval)
+
+                if not self.__stop.is_set():
+                    self.check()
+        finally:
+            if inotify:
+                inotify.close()
+
+    def start(self) -> "ConfigWatcher":
+        if self.__thread is None or not self.__thread.is_alive():
+            self.__stop.clear()
+            self.__thread = threading.Thread(
+                target=self.__run, name="argparser-config-watcher", daemon=True
+            )
+            self.__thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+
+def watch(
+    result: ParseResult | None = None,
+    interval: float = 1.0,
+    on_change: Callable[[ConfigChange], None] | None = None,
+    use_inotify: bool = True,
+) -> ConfigWatcher:
+    """Start watching the config of `result` (defaults to the current result) in a
+    background thread."""
+
+    watcher = ConfigWatcher(result, interval=interval, use_inotify=use_inotify)
+    if on_change:
+        watcher.subscribe(on_change)
+
+    return watcher.start()
@@ -1 +1,11 @@
+from .casters import *
+from .constraints import *
+from .mapped import *
+from .memo import *
+from .paths import *
+from .ranges import *
+from .streams import *
+from .suggest import *
+from .timeout import *
+from .trie import *
 from .utils import *
@@ -0,0 +1,392 @@
+import array
+import collections.abc
+import enum
+import inspect
+import types
+import typing
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+from ..headers.exceptions import ArgParserError
+from ..headers.types_c import bulk
+from .paths import PathType
+from .ranges import parse_range
+
+__all__ = [
+    "bulk_int",
+    "bulk_float",
+    "bulk_bool",
+    "LazyCaster",
+    "get_bulk_caster",
+    "get_caster",
+    "register_caster",
+]
+
+type _BulkCaster = Callable[[Sequence[str]], Any]
+
+_BOOL_LOOKUP: dict[str, bool] = {
+    **dict.fromkeys(("1", "t", "true", "y", "yes", "on"), True),
+    **dict.fromkeys(("0", "f", "false", "n", "no", "off"), False),
+}
+
+_TYPECODES: dict[type, str] = {int: "q", float: "d", bool: "b"}
+
+
+def _raise_for_first(
+    tokens: Sequence[str], caster: Callable[[str], Any], name: str
+) -> typing.NoReturn:
+    for token in tokens:
+        try:
+            caster(token)
+        except (ValueError, KeyError, AttributeError):
+            raise ValueError(f"Arg {token!r} could not be cast to {name}") from None
+
+    raise ValueError(f"Args do not fit in array of type {name}")
+
+
+def _to_bool(token: str) -> bool:
+    return _BOOL_LOOKUP[token.lower()]
+
+
+def bulk_int(
+    tokens: Sequence[str], packed: bool = False
+) -> list[int] | array.array[int]:
+    try:
+        if packed:
+            return array.array(_TYPECODES[int], map(int, tokens))
+        return list(map(int, tokens))
+    except (ValueError, OverflowError):
+        _raise_for_first(tokens, int, int.__name__)
+
+
+def bulk_float(
+    tokens: Sequence[str], packed: bool = False
+) -> list[float] | array.array[float]:
+    try:
+        if packed:
+            return array.array(_TYPECODES[float], map(float, tokens))
+        return list(map(float, tokens))
+    except ValueError:
+        _raise_for_first(tokens, float, float.__name__)
+
+
+def bulk_bool(
+    tokens: Sequence[str], packed: bool = False
+) -> list[bool] | array.array[int]:
+    try:
+        if packed:
+            return array.array(_TYPECODES[bool], map(_to_bool, tokens))
+        return list(map(_to_bool, tokens))
+    except (KeyError, AttributeError):
+        _raise_for_first(tokens, _to_bool, bool.__name__)
+
+
+_BULK_CASTERS: dict[type, Callable[[Sequence[str], bool], Any]] = {
+    int: bulk_int,
+    float: bulk_float,
+    bool: bulk_bool,
+}
+
+
+def _packed_caster(caster: Callable[[Sequence[str], bool], Any]) -> _BulkCaster:
+    def packed_caster(tokens: Sequence[str]) -> Any:
+        return caster(tokens, True)
+
+    packed_caster.__name__ = caster.__name__
+    return packed_caster
+
+
+def _bool_caster(token: str) -> bool:
+    try:
+        return _to_bool(token)
+    except KeyError:
+        raise ValueError(f"Arg {token!r} could not be cast to bool") from None
+
+
+_bool_caster.__name__ = bool.__name__
+
+# Annotations that can't cast a token by being called with it, and the types
+# registered with `register_caster`
+_CASTERS: dict[Any, Callable[[str], Any]] = {
+    range: parse_range,
+    bool: _bool_caster,
+}
+
+# Bumped by `register_caster`, so converters built before it are rebuilt
+_generation: int = 0
+
+
+class _Converter:
+    """The converter of one annotation. Its function is built on the first cast
+    and rebuilt after `register_caster`, so a caster registered after
+    `@argument` decorated a function still applies to it."""
+
+    def __init__(self, annotation: Any) -> None:
+        self.__annotation = annotation
+        self.__generation: int = -1
+        self.__func: Callable[[str], Any] | None = None
+        self.__name__ = _name(annotation)
+
+    def __call__(self, token: str) -> Any:
+        if self.__generation != _generation:
+            self.__func = _build_caster(self.__annotation)
+            self.__generation = _generation
+        return token if self.__func is None else self.__func(token)
+
+    def __repr__(self) -> str:
+        return f"{_Converter.__name__}({self.__name__})"
+
+
+# The converter of every annotation resolved so far, shared by all arguments
+_resolved: dict[Any, _Converter | None] = {}
+
+# Errors that make a union try its next member
+_CAST_ERRORS = (ValueError, TypeError, KeyError, ArgParserError)
+
+
+def _name(annotation: Any) -> str:
+    return getattr(annotation, "__name__", None) or repr(annotation)
+
+
+def _union_caster(annotation: Any) -> Callable[[str], Any] | None:
+    members = [i for i in typing.get_args(annotation) if i is not type(None)]
+    if len(members) == 1:
+        return get_caster(members[0])
+
+    casters = [get_caster(i) for i in members]
+    name = " | ".join(map(_name, members))
+
+    def union_caster(token: str) -> Any:
+        for caster in casters:
+            if caster is None:
+                return token
+            try:
+                return caster(token)
+            except _CAST_ERRORS:
+                continue
+        raise ValueError(f"Arg {token!r} could not be cast to {name}")
+
+    union_caster.__name__ = name
+    return union_caster
+
+
+def _literal_caster(annotation: Any) -> Callable[[str], Any]:
+    values = typing.get_args(annotation)
+    lookup = {str(i): i for i in values}
+    # Numbers are also matched by value, so "1" selects Literal[1.0]
+    numbers = {type(i) for i in values if type(i) in (int, float)}
+
+    def literal_caster(token: str) -> Any:
+        if token in lookup:
+            return lookup[token]
+        for number_type in numbers:
+            try:
+                number = number_type(token)
+            except ValueError:
+                continue
+            for value in values:
+                if type(value) in numbers and value == number:
+                    return value
+        raise ValueError(f"Arg {token!r} is not one of {', '.join(lookup)}")
+
+    literal_caster.__name__ = repr(annotation)
+    return literal_caster
+
+
+def _enum_caster(enum_type: type[enum.Enum]) -> Callable[[str], Any]:
+    # Names take precedence over values, exact names over lower case ones
+    lookup: dict[str, enum.Enum] = {str(i.value): i for i in enum_type}
+    lookup.update((k.lower(), v) for k, v in enum_type.__members__.items())
+    lookup.update(enum_type.__members__)
+
+    def enum_caster(token: str) -> Any:
+        if (member := lookup.get(token, lookup.get(token.lower()))) is None:
+            raise ValueError(
+                f"Arg {token!r} is not one of {', '.join(enum_type.__members__)}"
+            )
+        return member
+
+    enum_caster.__name__ = enum_type.__name__
+    return enum_caster
+
+
+def _sequence_caster(annotation: Any) -> Callable[[str], Any] | None:
+    """Casts a single comma separated token, for sequences that can't take
+    every token of the argument (`list[int] | None`)."""
+
+    origin, item_types = typing.get_origin(annotation), typing.get_args(annotation)
+
+    if origin is tuple and item_types and item_types[-1] is not Ellipsis:
+        casters = [get_caster(i) for i in item_types]
+
+        def tuple_caster(token: str) -> Any:
+            items = token.split(",")
+            if len(items) != len(casters):
+                raise ValueError(
+                    f"Arg {token!r} must have {len(casters)} comma separated values"
+                )
+            return tuple(c(i) if c else i for c, i in zip(casters, items))
+
+        tuple_caster.__name__ = repr(annotation)
+        return tuple_caster
+
+    caster = get_caster(item_types[0]) if item_types else None
+
+    def sequence_caster(token: str) -> Any:
+        items = token.split(",") if token else []
+        return origin(map(caster, items) if caster else items)
+
+    sequence_caster.__name__ = repr(annotation)
+    return sequence_caster
+
+
+def _build_caster(annotation: Any) -> Callable[[str], Any] | None:
+    if annotation is inspect.Parameter.empty or annotation is Any:
+        return None
+
+    try:
+        if (caster := _CASTERS.get(annotation)) is not None:
+            return caster
+    except TypeError:
+        pass
+
+    origin = typing.get_origin(annotation)
+    if origin is types.UnionType or origin is typing.Union:
+        return _union_caster(annotation)
+    if origin is typing.Literal:
+        return _literal_caster(annotation)
+    if origin is typing.Annotated:
+        return get_caster(typing.get_args(annotation)[0])
+    if origin is list or origin is tuple:
+        return _sequence_caster(annotation)
+    if origin is not None:
+        return None
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        return _enum_caster(annotation)
+
+    return annotation if callable(annotation) else None
+
+
+def register_caster(annotation: Any, caster: Callable[[str], Any]) -> None:
+    """Cast the tokens of parameters annotated with `annotation` with `caster`,
+    also where `annotation` appears in a union, list or tuple."""
+
+    global _generation
+
+    _CASTERS[annotation] = caster
+    _generation += 1
+
+
+def get_caster(annotation: Any) -> Callable[[str], Any] | None:
+    """The converter of a token for a parameter annotation, or None if the
+    token is passed as is.
+
+    Each distinct annotation is resolved once into a specialized function,
+    shared by every argument, and again after `register_caster`. Unions (and
+    Optional) try their members in order, `list[T]` and `tuple[T, ...]` split a
+    token on commas and an Enum is looked up by name, then by value."""
+
+    if annotation is inspect.Parameter.empty or annotation is Any:
+        return None
+
+    try:
+        return _resolved[annotation]
+    except KeyError:
+        caster = _resolved[annotation] = _Converter(annotation)
+        return caster
+    except TypeError:
+        return _Converter(annotation)
+
+
+def _item_caster(
+    container: Callable[[Iterable[Any]], Any], caster: Callable[[str], Any] | None
+) -> _BulkCaster:
+    def item_caster(tokens: Sequence[str]) -> Any:
+        return container(map(caster, tokens) if caster else tokens)
+
+    item_caster.__name__ = getattr(caster, "__name__", "str")
+    return item_caster
+
+
+def _container_caster(
+    container: Callable[[Iterable[Any]], Any], caster: _BulkCaster
+) -> _BulkCaster:
+    def container_caster(tokens: Sequence[str]) -> Any:
+        return container(caster(tokens))
+
+    container_caster.__name__ = caster.__name__
+    return container_caster
+
+
+class LazyCaster:
+    """Casts the tokens of an `Iterator[T]`/`Iterable[T]` parameter one at a time,
+    as the parse function iterates over them."""
+
+    def __init__(self, caster: Callable[[str], Any] | None) -> None:
+        self.caster = caster
+
+    @property
+    def __name__(self) -> str:
+        return f"lazy {getattr(self.caster, '__name__', 'str')}"
+
+    def __call__(self, tokens: Iterable[str]) -> Iterator[Any]:
+        return iter(tokens) if self.caster is None else map(self.caster, tokens)
+
+
+_LAZY_ORIGINS = (collections.abc.Iterator, collections.abc.Iterable)
+
+
+def get_bulk_caster(
+    annotation: Any, accepts_star: bool
+) -> tuple[_BulkCaster, bool] | None:
+    """Select a bulk caster for a parameter annotation.
+
+    Returns the caster and whether its result is passed as a single (packed)
+    object, or None if the annotation has no bulk caster.
+
+    `*args: int` casts the tokens in one call and unpacks them, while
+    `arg: list[int]` and `arg: array[int]` receive the sequence itself and
+    `arg: Iterator[int]` an iterator that casts the tokens lazily."""
+
+    if isinstance(annotation, bulk):
+        return annotation, not accepts_star
+
+    if isinstance(annotation, PathType):
+        return (annotation.bulk, False) if accepts_star else None
+
+    if accepts_star:
+        if annotation is str:
+            return list, False
+        if (caster := _BULK_CASTERS.get(annotation)) is None:
+            return None
+        return caster, False
+
+    origin = typing.get_origin(annotation)
+    if origin in _LAZY_ORIGINS:
+        (item_type,) = typing.get_args(annotation) or (str,)
+        return LazyCaster(None if item_type is str else get_caster(item_type)), True
+
+    item_types = typing.get_args(annotation)
+    if origin is tuple and item_types[1:] != (Ellipsis,):
+        return None
+    if origin is not list and origin is not tuple and origin is not array.array:
+        return None
+
+    item_type = item_types[0] if item_types else str
+
+    if isinstance(item_type, PathType):
+        if origin is array.array:
+            return None
+        # The paths are checked together, like for `*args: PathType`
+        if origin is list:
+            return item_type.bulk, True
+        return _container_caster(tuple, item_type.bulk), True
+
+    if origin is list and item_type is str:
+        return list, True
+
+    if (caster := _BULK_CASTERS.get(item_type)) is None or origin is tuple:
+        if origin is array.array:
+            return None
+        return _item_caster(origin, get_caster(item_type)), True
+
+    return (_packed_caster(caster) if origin is array.array else caster), True
@@ -0,0 +1,161 @@
+import abc
+import bisect
+import re
+from typing import Any, Callable, Iterable, Sequence
+
+from ..headers.exceptions import ArgumentError
+
+__all__ = ["Constraint", "Regex", "Range", "OneOf", "Predicate", "compile_constraint"]
+
+
+class Constraint(abc.ABC):
+    """Validates every token of an argument in a single pass.
+
+    Constraints with `on_values` set are checked against the cast values,
+    otherwise against the raw tokens (before casting)."""
+
+    on_values: bool = False
+
+    @abc.abstractmethod
+    def failures(self, tokens: Sequence[str], values: Sequence[Any]) -> list[int]:
+        """Indexes of the tokens that do not satisfy the constraint."""
+
+    @abc.abstractmethod
+    def describe(self) -> str: ...
+
+    def check(self, tokens: Sequence[str], values: Sequence[Any]) -> None:
+        if failed := self.failures(tokens, values):
+            raise ValueError(
+                f"Args {[tokens[i] for i in failed]} are not in constraints "
+                + self.describe()
+            )
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.describe()})"
+
+
+class Regex(Constraint):
+    """Tokens must fully match `pattern`."""
+
+    def __init__(self, pattern: str | re.Pattern[str], flags: int = 0) -> None:
+        self.__pattern = re.compile(pattern, flags)
+
+    def failures(self, tokens: Sequence[str], values: Sequence[Any]) -> list[int]:
+        fullmatch = self.__pattern.fullmatch
+        return [c for c, token in enumerate(tokens) if fullmatch(token) is None]
+
+    def describe(self) -> str:
+        return f"/{self.__pattern.pattern}/"
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class Range(Constraint):
+    """Values must fall in one of the closed intervals `[low, high]`.
+
+    `Range(0, 10)` is a single interval, `Range((0, 10), (20, 30))` several.
+    Overlapping intervals are merged and membership is found with a binary
+    search over the interval starts."""
+
+    on_values = True
+
+    def __init__(self, *intervals: float | tuple[float, float]) -> None:
+        if len(intervals) == 2 and all(map(_is_number, intervals)):
+            intervals = ((intervals[0], intervals[1]),)  # type: ignore
+
+        if not intervals or not all(
+            isinstance(i, tuple) and len(i) == 2 and all(map(_is_number, i))
+            for i in intervals
+        ):
+            raise ArgumentError(
+                "Range takes a low and a high bound or (low, high) tuples, "
+                + f"not {intervals!r}"
+            )
+
+        merged: list[list[float]] = []
+        for low, high in sorted(intervals):  # type: ignore
+            if low > high:
+                raise ArgumentError(f"Range interval ({low}, {high}) is empty")
+            if merged and low <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], high)
+            else:
+                merged.append([low, high])
+
+        self.__starts: list[float] = [i[0] for i in merged]
+        self.__ends: list[float] = [i[1] for i in merged]
+
+    def __contains__(self, value: Any) -> bool:
+        index = bisect.bisect_right(self.__starts, value) - 1
+        return index >= 0 and value <= self.__ends[index]
+
+    def failures(self, tokens: Sequence[str], values: Sequence[Any]) -> list[int]:
+        failed: list[int] = []
+        for c, value in enumerate(values):
+            try:
+                if value in self:
+                    continue
+            except TypeError:
+                pass
+            failed.append(c)
+        return failed
+
+    def describe(self) -> str:
+        return ",".join(f"{s}..{e}" for s, e in zip(self.__starts, self.__ends))
+
+
+class OneOf(Constraint):
+    """Values must be one of `choices`, checked with a hashed set.
+
+    Compared against the cast values unless `raw` is set, in which case the raw
+    tokens are compared."""
+
+    def __init__(self, choices: Iterable[Any], raw: bool = False) -> None:
+        self.__choices: tuple[Any, ...] = tuple(dict.fromkeys(choices))
+        self.__lookup: frozenset[Any] = frozenset(self.__choices)
+        self.on_values = not raw
+
+    def failures(self, tokens: Sequence[str], values: Sequence[Any]) -> list[int]:
+        lookup = self.__lookup
+        items = values if self.on_values else tokens
+        return [c for c, value in enumerate(items) if value not in lookup]
+
+    def describe(self) -> str:
+        return ",".join(map(str, self.__choices))
+
+
+class Predicate(Constraint):
+    """Tokens must make `func` return True. Described by the function's doc."""
+
+    def __init__(self, func: Callable[[str], bool]) -> None:
+        self.__func = func
+
+    def failures(self, tokens: Sequence[str], values: Sequence[Any]) -> list[int]:
+        return [c for c, valid in enumerate(map(self.__func, tokens)) if not valid]
+
+    def describe(self) -> str:
+        if doc := self.__func.__doc__:
+            return re.sub(r"\s{2,}", " ", doc.strip())
+        return ""
+
+    def check(self, tokens: Sequence[str], values: Sequence[Any]) -> None:
+        if failed := self.failures(tokens, values):
+            raise ValueError(
+                f"Args {[tokens[i] for i in failed]} returned False when passed "
+                + "to validator function"
+            )
+
+
+def compile_constraint(
+    constraints: Constraint | list[str] | Callable[[str], bool] | None,
+) -> Constraint | None:
+    """Turn the `constraints` given to an argument into a `Constraint`."""
+
+    if constraints is None or isinstance(constraints, Constraint):
+        return constraints
+    if isinstance(constraints, (list, tuple, set, frozenset)):
+        choices: list[str] = list(constraints)  # pyright: ignore
+        return OneOf(choices, raw=True)
+
+    return Predicate(constraints)
@@ -0,0 +1,40 @@
+import mmap
+import os
+
+from ..headers.exceptions import ParsingError
+
+__all__ = ["MappedFileType", "MappedFile"]
+
+
+class MappedFileType:
+    """A parameter annotation that maps a file read-only into memory.
+
+    The parse function gets an `mmap.mmap`, so the file is paged in on demand
+    and shared through the page cache with every other process that maps it.
+    Slice a `memoryview` of it to avoid copying. The mapping is owned by the
+    current `ParseResult` and closed with it."""
+
+    def __init__(self, name: str = "MappedFile") -> None:
+        self.__name = name
+
+    @property
+    def __name__(self) -> str:
+        return self.__name
+
+    def __call__(self, token: str) -> mmap.mmap:
+        # Imported here as the classes import utils
+        from ..classes.parse_result import ParseResult
+
+        try:
+            with open(token, "rb") as stream:
+                if os.fstat(stream.fileno()).st_size == 0:
+                    raise ParsingError(f"{token!r} is empty and can't be mapped")
+                mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError as e:
+            raise ParsingError(f"{token!r} can't be mapped: {e.strerror}") from e
+
+        ParseResult.current().own(mapped)
+        return mapped
+
+
+MappedFile = MappedFileType()
@@ -0,0 +1,159 @@
+import hashlib
+import marshal
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Any, Callable
+
+from .utils import atomic_write, cache_subdir
+
+__all__ = ["DiskMemo"]
+
+_MISS = object()
+
+
+def _code_hash(func: Callable[..., Any]) -> str:
+    code = getattr(func, "__code__", None)
+    if code is None:
+        return ""
+
+    digest = hashlib.sha256(marshal.dumps(code))
+    for const in getattr(func, "__defaults__", None) or ():
+        digest.update(repr(const).encode())
+
+    return digest.hexdigest()
+
+
+def _path_stamps(values: Any, stamps: list[tuple[str, int, int]]) -> None:
+    if isinstance(values, os.PathLike):
+        try:
+            stat = os.stat(values)  # pyright: ignore[reportUnknownArgumentType]
+            stamps.append((os.fspath(values), stat.st_mtime_ns, stat.st_size))  # type: ignore
+        except OSError:
+            stamps.append((os.fspath(values), -1, -1))  # type: ignore
+    elif isinstance(values, (list, tuple)):
+        for value in values:  # pyright: ignore[reportUnknownVariableType]
+            _path_stamps(value, stamps)
+
+
+class DiskMemo:
+    """Memoizes a pure function on disk, across invocations.
+
+    Results are pickled into one file per call, keyed by the function's
+    qualified name and code hash and the pickled arguments. With `stamp_paths`
+    set the mtimes and sizes of any `Path` arguments are part of the key, so
+    editing an input file misses the cache. Files are touched on every hit and
+    the least recently used ones are removed once the cache is larger than
+    `max_bytes`.
+
+    Arguments or results that cannot be pickled are simply not cached."""
+
+    max_bytes: int = 64 * 1024 * 1024
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        stamp_paths: bool = False,
+        max_bytes: int | None = None,
+    ) -> None:
+        self.__func = func
+        self.__stamp_paths = stamp_paths
+        self.__prefix = (
+            f"{func.__module__}.{func.__qualname__}",
+            _code_hash(func),
+            sys.implementation.cache_tag,
+        )
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+
+    @staticmethod
+    def directory() -> Path | None:
+        return cache_subdir("memo")
+
+    def key(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> str | None:
+        stamps: list[tuple[str, int, int]] = []
+        if self.__stamp_paths:
+            _path_stamps(args, stamps)
+            _path_stamps(tuple(kwargs.values()), stamps)
+
+        try:
+            payload = pickle.dumps(
+                (self.__prefix, args, sorted(kwargs.items()), stamps),
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return None
+
+        return hashlib.sha256(payload).hexdigest()
+
+    def __read(self, path: Path) -> Any:
+        try:
+            with open(path, "rb") as stream:
+                value = pickle.load(stream)
+        except FileNotFoundError:
+            return _MISS
+        except Exception:
+            # Truncated or written by an incompatible version
+            path.unlink(missing_ok=True)
+            return _MISS
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return value
+
+    def __write(self, path: Path, value: Any) -> None:
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return None
+
+        if atomic_write(path, data):
+            self.evict(path.parent)
+
+    def evict(self, directory: Path) -> None:
+        """Remove the least recently used entries until the cache fits in
+        `max_bytes`."""
+
+        entries: list[tuple[int, int, str]] = []
+        total: int = 0
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(".pkl"):
+                        continue
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                    total += stat.st_size
+        except OSError:
+            return None
+
+        if total <= self.max_bytes:
+            return None
+
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            if (total := total - size) <= self.max_bytes:
+                break
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        if (directory := self.directory()) is None or (
+            key := self.key(args, kwargs)
+        ) is None:
+            return self.__func(*args, **kwargs)
+
+        path = directory.joinpath(f"{key}.pkl")
+        if (value := self.__read(path)) is not _MISS:
+            return value
+
+        value = self.__func(*args, **kwargs)
+        self.__write(path, value)
+
+        return value
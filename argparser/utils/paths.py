@@ -0,0 +1,256 @@
+import fnmatch
+import os
+import re
+import stat
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Literal, Sequence
+
+from ..headers.exceptions import ParsingError
+
+__all__ = ["PathType", "ExistingPath", "FilePath", "DirPath", "GlobPath"]
+
+type _PathKind = Literal["exists", "file", "dir"]
+# (path, is_file, is_dir)
+type _Entry = tuple[str, bool, bool]
+
+_MAGIC_CHECK = re.compile(r"[*?[]")
+
+# A directory that went missing or can't be listed has no matches
+_IGNORED_ERRORS = (FileNotFoundError, NotADirectoryError, PermissionError)
+
+
+def _has_magic(part: str) -> bool:
+    return _MAGIC_CHECK.search(part) is not None
+
+
+def _stat(path: str) -> _Entry | None:
+    try:
+        st_mode = os.stat(path).st_mode
+    except OSError:
+        return None
+
+    return path, stat.S_ISREG(st_mode), stat.S_ISDIR(st_mode)
+
+
+def _describe(entry: os.DirEntry[str], entry_path: str) -> _Entry:
+    try:
+        is_dir = entry.is_dir()
+        return entry_path, not is_dir and entry.is_file(), is_dir
+    except OSError:
+        # A symlink that loops
+        return entry_path, False, False
+
+
+def _read_error(path: str, e: OSError) -> str:
+    return f"{path or '.'!r} could not be read: {e.strerror}"
+
+
+def _scan(path: str) -> tuple[list[str], list[_Entry], str | None]:
+    """The entries of a directory and its sub directories to recurse into, which
+    don't include symlinks so `**` can't loop."""
+
+    sub_dirs: list[str] = []
+    entries: list[_Entry] = []
+
+    try:
+        with os.scandir(path or ".") as it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue
+
+                entry_path = os.path.join(path, entry.name) if path else entry.name
+                entries.append(_describe(entry, entry_path))
+                if entry.is_dir(follow_symlinks=False):
+                    sub_dirs.append(entry_path)
+    except _IGNORED_ERRORS:
+        pass
+    except OSError as e:
+        return sub_dirs, entries, _read_error(path, e)
+
+    return sub_dirs, entries, None
+
+
+def _scan_match(
+    path: str, regex: re.Pattern[str], hidden: bool
+) -> tuple[list[_Entry], str | None]:
+    matched: list[_Entry] = []
+
+    try:
+        with os.scandir(path or ".") as it:
+            for entry in it:
+                if not hidden and entry.name.startswith("."):
+                    continue
+                if not regex.match(entry.name):
+                    continue
+
+                entry_path = os.path.join(path, entry.name) if path else entry.name
+                matched.append(_describe(entry, entry_path))
+    except _IGNORED_ERRORS:
+        pass
+    except OSError as e:
+        return matched, _read_error(path, e)
+
+    return matched, None
+
+
+def _walk(
+    dirs: list[str], executor: Executor, errors: list[str]
+) -> tuple[list[str], list[_Entry]]:
+    all_dirs: list[str] = list(dirs)
+    all_entries: list[_Entry] = []
+
+    level = dirs
+    while level:
+        next_level: list[str] = []
+        for sub_dirs, entries, error in executor.map(_scan, level):
+            next_level.extend(sub_dirs)
+            all_entries.extend(entries)
+            if error:
+                errors.append(error)
+
+        all_dirs.extend(next_level)
+        level = next_level
+
+    return all_dirs, all_entries
+
+
+def _glob(pattern: str, executor: Executor, errors: list[str]) -> list[_Entry]:
+    """Expand `pattern`. Directories that can't be read are added to `errors`."""
+
+    parts = Path(os.path.expanduser(pattern)).parts
+
+    index: int = 0
+    while index < len(parts) and not _has_magic(parts[index]):
+        index += 1
+
+    anchor = os.path.join(*parts[:index]) if index else ""
+    if index == len(parts):
+        return [entry] if (entry := _stat(anchor)) else []
+
+    dirs: list[str] = [anchor]
+    last_index = len(parts) - 1
+
+    for c, part in enumerate(parts[index:], start=index):
+        is_last = c == last_index
+
+        if part == "**":
+            dirs, entries = _walk(dirs, executor, errors)
+            if is_last:
+                return entries
+            continue
+
+        if _has_magic(part):
+            regex = re.compile(fnmatch.translate(part))
+            hidden = part.startswith(".")
+            matched: list[_Entry] = []
+            for entries, error in executor.map(
+                lambda d: _scan_match(d, regex, hidden), dirs
+            ):
+                matched.extend(entries)
+                if error:
+                    errors.append(error)
+        else:
+            paths = [os.path.join(d, part) if d else part for d in dirs]
+            matched = [entry for entry in executor.map(_stat, paths) if entry]
+
+        if is_last:
+            return matched
+
+        dirs = [entry[0] for entry in matched if entry[2]]
+
+    return []
+
+
+class PathType:
+    """A parameter annotation that validates (and optionally glob expands) paths.
+
+    Globs are expanded with `os.scandir` and paths are checked on a thread pool.
+    Results are sorted and deduplicated, and every failure is reported in a
+    single `ParsingError`."""
+
+    def __init__(
+        self,
+        kind: _PathKind = "exists",
+        glob: bool = False,
+        name: str | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        self.__kind: _PathKind = kind
+        self.__glob = glob
+        self.__name = name or f"{kind.capitalize()}{'Glob' if glob else 'Path'}"
+        self.__max_workers = max_workers
+
+    @property
+    def __name__(self) -> str:
+        return self.__name
+
+    def __matches_kind(self, entry: _Entry) -> bool:
+        match self.__kind:
+            case "file":
+                return entry[1]
+            case "dir":
+                return entry[2]
+            case "exists":
+                return True
+
+    def __validate(self, token: str, entry: _Entry | None) -> str | None:
+        if entry is None:
+            return f"{token!r} does not exist"
+        if not self.__matches_kind(entry):
+            return f"{token!r} is not a {self.__kind}"
+        return None
+
+    def bulk(self, tokens: Sequence[str]) -> list[Path]:
+        errors: list[str] = []
+        found: set[str] = set()
+
+        patterns: list[str] = []
+        literals: list[str] = []
+        for token in tokens:
+            (patterns if self.__glob and _has_magic(token) else literals).append(token)
+
+        if patterns or len(literals) > 1:
+            with ThreadPoolExecutor(self.__max_workers) as executor:
+                for token in patterns:
+                    matched = [
+                        os.path.normpath(i[0])
+                        for i in _glob(token, executor, errors)
+                        if self.__matches_kind(i)
+                    ]
+                    if not matched:
+                        kind = "path" if self.__kind == "exists" else self.__kind
+                        errors.append(f"{token!r} did not match any {kind}")
+                    found.update(matched)
+
+                entries = list(executor.map(_stat, literals))
+        else:
+            # A single path is checked without starting a thread pool
+            entries = list(map(_stat, literals))
+
+        for token, entry in zip(literals, entries):
+            if error := self.__validate(token, entry):
+                errors.append(error)
+            else:
+                found.add(os.path.normpath(token))
+
+        if errors:
+            raise ParsingError(
+                f"{len(errors)} invalid path(s) for {self.__name}:\n\t"
+                + "\n\t".join(errors)
+            )
+
+        return list(map(Path, sorted(found)))
+
+    def __call__(self, token: str, /) -> Path | list[Path]:
+        paths = self.bulk((token,))
+        return paths if self.__glob else paths[0]
+
+    def __repr__(self) -> str:
+        return f"{PathType.__name__}(kind={self.__kind!r}, glob={self.__glob})"
+
+
+ExistingPath = PathType("exists", name="ExistingPath")
+FilePath = PathType("file", name="FilePath")
+DirPath = PathType("dir", name="DirPath")
+GlobPath = PathType("exists", glob=True, name="GlobPath")
@@ -0,0 +1,141 @@
+import bisect
+import heapq
+import itertools
+import re
+from typing import Iterable, Iterator
+
+__all__ = ["IntervalSet", "parse_range"]
+
+# a-b (inclusive), a, or start:stop[:step] (half open, like a slice)
+_INCLUSIVE = re.compile(r"(\d+)(?:-(\d+))?")
+_SLICE = re.compile(r"(-?\d*):(-?\d+)(?::(-?\d+))?")
+
+
+def parse_range(token: str) -> range:
+    """Parse `a-b` (inclusive), `a` or `start:stop[:step]` into a `range`.
+
+    Negative steps are turned around, so the range is always ascending."""
+
+    token = token.strip()
+
+    if match := _INCLUSIVE.fullmatch(token):
+        start, end = match.group(1), match.group(2)
+        r = range(int(start), int(end or start) + 1)
+    elif match := _SLICE.fullmatch(token):
+        start, stop, step = match.groups()
+        step = int(step or 1)
+        if step == 0:
+            raise ValueError(f"Range {token!r} has a step of 0")
+        r = range(int(start or 0), int(stop), step)
+    else:
+        raise ValueError(
+            f"{token!r} is not a range (expected a-b, a or start:stop[:step])"
+        )
+
+    return r[::-1] if r.step < 0 else r
+
+
+def _count_between(r: range, start: int, stop: int) -> int:
+    """How many numbers of the ascending range `r` are in `range(start, stop)`."""
+
+    first = max(0, -((r.start - start) // r.step))
+    last = min(len(r), -((r.start - stop) // r.step))
+    return max(0, last - first)
+
+
+class IntervalSet:
+    """A set of integers given as comma separated ranges, such as
+    `0-4095,8192-12287` or `1:10000000:3`.
+
+    Only the ranges are stored, so memory doesn't depend on how many numbers
+    they cover. Overlapping and adjacent ranges with a step of 1 are merged, so
+    membership in them is a binary search over their starts. Ranges with another
+    step are kept apart and checked one by one, so a lookup is O(log n + k) for
+    n contiguous and k strided ranges. Iteration is lazy and ascending, without
+    duplicates. `len` is O(n) with at most one strided range, but has to iterate
+    over the numbers when strided ranges may overlap each other."""
+
+    def __init__(self, spec: str | Iterable[range] = ()) -> None:
+        if isinstance(spec, str):
+            ranges = [parse_range(i) for i in spec.split(",") if i.strip()]
+        else:
+            ranges = [r[::-1] if r.step < 0 else r for r in spec]
+
+        contiguous: list[range] = []
+        strided: list[range] = []
+        for r in sorted((r for r in ranges if r), key=lambda r: (r.start, r.step)):
+            if len(r) == 1:
+                r = range(r.start, r.start + 1)
+            if r.step != 1:
+                strided.append(r)
+            elif contiguous and r.start <= contiguous[-1].stop:
+                contiguous[-1] = range(
+                    contiguous[-1].start, max(contiguous[-1].stop, r.stop)
+                )
+            else:
+                contiguous.append(r)
+
+        self.__ranges: tuple[range, ...] = tuple(
+            sorted((*contiguous, *strided), key=lambda r: (r.start, r.step))
+        )
+        self.__contiguous: tuple[range, ...] = tuple(contiguous)
+        self.__strided: tuple[range, ...] = tuple(strided)
+        self.__starts: list[int] = [r.start for r in contiguous]
+
+    @property
+    def ranges(self) -> tuple[range, ...]:
+        return self.__ranges
+
+    def __contains__(self, value: object) -> bool:
+        if not isinstance(value, int):
+            return False
+
+        index = bisect.bisect_right(self.__starts, value) - 1
+        if index >= 0 and value < self.__contiguous[index].stop:
+            return True
+
+        return any(value in r for r in self.__strided)
+
+    def __iter__(self) -> Iterator[int]:
+        if not self.__strided:
+            return itertools.chain.from_iterable(self.__contiguous)
+
+        return (k for k, _ in itertools.groupby(heapq.merge(*self.__ranges)))
+
+    def __len__(self) -> int:
+        size = sum(map(len, self.__contiguous))
+        if not self.__strided:
+            return size
+
+        if len(self.__strided) == 1:
+            (r,) = self.__strided
+            overlap = sum(_count_between(r, c.start, c.stop) for c in self.__contiguous)
+            return size + len(r) - overlap
+
+        return sum(1 for _ in self)
+
+    def __bool__(self) -> bool:
+        return bool(self.__ranges)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return self.__ranges == other.__ranges
+
+    def __hash__(self) -> int:
+        return hash(self.__ranges)
+
+    def __str__(self) -> str:
+        parts: list[str] = []
+        for r in self.__ranges:
+            if r.step != 1:
+                parts.append(f"{r.start}:{r.stop}:{r.step}")
+            elif len(r) == 1:
+                parts.append(f"{r.start}")
+            else:
+                parts.append(f"{r.start}-{r[-1]}")
+
+        return ",".join(parts)
+
+    def __repr__(self) -> str:
+        return f"{IntervalSet.__name__}({str(self)!r})"
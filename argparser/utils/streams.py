@@ -0,0 +1,48 @@
+import os
+import re
+from typing import Iterator
+
+__all__ = ["is_stream_token", "read_tokens"]
+
+# "-" is stdin, "fd:N" an inherited file descriptor
+_STDIN = "-"
+_FD = re.compile(r"fd:(\d+)")
+
+_CHUNK_SIZE = 1 << 16
+
+
+def is_stream_token(token: str) -> bool:
+    return token == _STDIN or _FD.fullmatch(token) is not None
+
+
+def read_tokens(token: str) -> Iterator[str]:
+    """Lazily read values from stdin (`-`) or a file descriptor (`fd:N`).
+
+    Values are NUL-delimited if the first chunk read contains a NUL (as written
+    by `find -print0`), and one per line otherwise. Empty values are skipped.
+    Reads return as soon as data is available, so values are yielded as they
+    arrive and only one chunk is held in memory. The descriptor isn't closed."""
+
+    fd = 0 if token == _STDIN else int(token[3:])
+
+    def tokens() -> Iterator[str]:
+        delimiter: bytes | None = None
+        pending = b""
+
+        while chunk := os.read(fd, _CHUNK_SIZE):
+            if delimiter is None:
+                delimiter = b"\0" if b"\0" in chunk else b"\n"
+
+            *values, pending = (pending + chunk).split(delimiter)
+            for value in values:
+                if delimiter == b"\n":
+                    value = value.removesuffix(b"\r")
+                if value:
+                    yield os.fsdecode(value)
+
+        if delimiter == b"\n":
+            pending = pending.removesuffix(b"\r")
+        if pending:
+            yield os.fsdecode(pending)
+
+    return tokens()
@@ -0,0 +1,86 @@
+import heapq
+import time
+from typing import Iterable
+
+__all__ = ["SuggestionIndex", "edit_distance"]
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance between `a` and `b`, or `limit + 1` once it is
+    known to exceed `limit`."""
+
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    prev_row = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        row = [i]
+        for j, char_b in enumerate(b, start=1):
+            row.append(
+                min(
+                    prev_row[j] + 1,
+                    row[j - 1] + 1,
+                    prev_row[j - 1] + (char_a != char_b),
+                )
+            )
+        if min(row) > limit:
+            return limit + 1
+        prev_row = row
+
+    return prev_row[-1]
+
+
+class SuggestionIndex:
+    """An n-gram index over a fixed set of words used for "did you mean" hints.
+
+    Candidates are gathered from the posting lists of the query's n-grams, so a
+    lookup never scans every word. Only the best scoring candidates are checked
+    with an edit distance, and checking stops once the time budget is spent."""
+
+    def __init__(self, words: Iterable[str], n: int = 3, strip: str = "") -> None:
+        self.__n = n
+        self.__strip = strip
+        self.__words: list[str] = sorted(set(words))
+        self.__gram_counts: list[int] = []
+        self.__postings: dict[str, list[int]] = {}
+
+        for index, word in enumerate(self.__words):
+            grams = self.__grams(word)
+            self.__gram_counts.append(len(grams))
+            for gram in grams:
+                self.__postings.setdefault(gram, []).append(index)
+
+    def __grams(self, word: str) -> set[str]:
+        padded = f" {word.lstrip(self.__strip)} "
+        return {padded[i : i + self.__n] for i in range(len(padded) - self.__n + 1)}
+
+    def suggest(self, word: str, k: int = 3, budget: float = 0.005) -> list[str]:
+        """Return up to `k` indexed words close to `word`, best first."""
+
+        deadline = time.perf_counter() + budget
+        grams = self.__grams(word)
+
+        shared: dict[int, int] = {}
+        for gram in grams:
+            for index in self.__postings.get(gram, ()):
+                shared[index] = shared.get(index, 0) + 1
+
+        candidates = heapq.nlargest(
+            max(k * 4, 16),
+            shared,
+            key=lambda i: 2 * shared[i] / (len(grams) + self.__gram_counts[i]),
+        )
+
+        stripped = word.lstrip(self.__strip)
+        limit = max(1, len(stripped) // 3)
+
+        scored: list[tuple[int, str]] = []
+        for index in candidates:
+            candidate = self.__words[index]
+            distance = edit_distance(stripped, candidate.lstrip(self.__strip), limit)
+            if distance <= limit:
+                scored.append((distance, candidate))
+            if time.perf_counter() > deadline:
+                break
+
+        return [i[1] for i in sorted(scored)[:k]]
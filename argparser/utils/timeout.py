@@ -0,0 +1,62 @@
+import asyncio
+import contextvars
+import inspect
+import threading
+import time
+from concurrent.futures import Future, wait
+from typing import Any, Callable
+
+__all__ = ["call_with_timeout"]
+
+
+class _TimedOut(Exception):
+    """Raised by `call_with_timeout` when the time runs out. Kept apart from
+    `TimeoutError` so a callback's own timeouts propagate unchanged."""
+
+
+def call_with_timeout(
+    func: Callable[..., Any],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    timeout: float,
+) -> Any:
+    """Call `func` on a worker thread and wait at most `timeout` seconds for it.
+
+    The call runs in a copy of the current context, so it sees the same
+    `ParseResult`. If it returns a coroutine, the coroutine is run on the worker
+    thread and cancelled once the timeout runs out. A synchronous function can't
+    be interrupted: it is left running on a daemon thread. Raises `_TimedOut`
+    if the call did not finish in time, exceptions of the call are re-raised."""
+
+    future: Future[Any] = Future()
+    context = contextvars.copy_context()
+    end = time.monotonic() + timeout
+
+    async def run_coroutine(coroutine: Any) -> Any:
+        scope = asyncio.timeout(max(end - time.monotonic(), 0))
+        try:
+            async with scope:
+                return await coroutine
+        except TimeoutError:
+            # Raised by the scope on expiry, not by the coroutine itself
+            if scope.expired():
+                raise _TimedOut from None
+            raise
+
+    def run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return None
+        try:
+            value = context.run(func, *args, **kwargs)
+            if inspect.iscoroutine(value):
+                value = context.run(asyncio.run, run_coroutine(value))
+            future.set_result(value)
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="argparser-callback", daemon=True).start()
+
+    if not wait((future,), timeout).done:
+        raise _TimedOut
+
+    return future.result()
@@ -0,0 +1,66 @@
+__all__ = ["PrefixTrie"]
+
+
+class _Node[T]:
+    __slots__ = ("children", "value", "ambiguous", "key")
+
+    def __init__(self) -> None:
+        self.children: dict[str, "_Node[T]"] = {}
+        self.value: T | None = None
+        self.ambiguous: bool = False
+        self.key: str | None = None
+
+
+class PrefixTrie[T]:
+    """Maps unique prefixes of the inserted keys to their values.
+
+    Each node records whether every key below it maps to the same value, so a
+    lookup only walks the characters of the prefix."""
+
+    def __init__(self) -> None:
+        self.__root: _Node[T] = _Node()
+
+    def insert(self, key: str, value: T) -> None:
+        node = self.__root
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+            if node.value is None:
+                node.value = value
+            elif node.value is not value:
+                node.ambiguous = True
+        node.key = key
+
+    def __find(self, prefix: str) -> _Node[T] | None:
+        node = self.__root
+        for char in prefix:
+            if (node := node.children.get(char)) is None:
+                return None
+        return node
+
+    def match(self, prefix: str) -> tuple[T | None, list[str]]:
+        """Return the value for `prefix` if it is unambiguous.
+
+        Otherwise returns None and the keys that share the prefix (empty if no
+        key starts with `prefix`)."""
+
+        if (node := self.__find(prefix)) is None or node is self.__root:
+            return None, []
+
+        if not node.ambiguous:
+            return node.value, []
+
+        return None, self.keys(prefix)
+
+    def keys(self, prefix: str = "") -> list[str]:
+        if (node := self.__find(prefix)) is None:
+            return []
+
+        keys: list[str] = []
+        stack: list[_Node[T]] = [node]
+        while stack:
+            node = stack.pop()
+            if node.key is not None:
+                keys.append(node.key)
+            stack.extend(node.children.values())
+
+        return sorted(keys)
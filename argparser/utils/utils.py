@@ -1,16 +1,110 @@
 import inspect
+import os
+import urllib.parse
 from pathlib import Path
 from typing import Any, Callable
 
+from ..headers.exceptions import ArgumentError
 from ..headers.types_c import FuncSignature, FuncType, Parameter, null
+from .casters import get_bulk_caster, get_caster
+
+__all__ = [
+    "read_function_signature",
+    "config_func",
+    "config_source",
+    "split_profile",
+    "is_url",
+    "cache_dir",
+    "cache_subdir",
+    "atomic_write",
+]
+
+_URL_SCHEMES = ("http://", "https://")
+
+
+def cache_dir() -> Path | None:
+    """Directory for argparser's on-disk caches.
+
+    Taken from $ARGPARSER_CACHE_DIR, then $XDG_CACHE_HOME/argparser, then
+    ~/.cache/argparser. Returns None if caching is disabled (the variable is set
+    but empty) or the directory cannot be created."""
+
+    if (env_dir := os.environ.get("ARGPARSER_CACHE_DIR")) is not None:
+        if not env_dir:
+            return None
+        path = Path(env_dir)
+    elif xdg_dir := os.environ.get("XDG_CACHE_HOME"):
+        path = Path(xdg_dir, "argparser")
+    else:
+        path = Path.home().joinpath(".cache", "argparser")
+
+    try:
+        path.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+
+    return path
+
+
+def cache_subdir(name: str) -> Path | None:
+    """The directory `name` in `cache_dir()`, or None if it can't be created."""
+
+    if (directory := cache_dir()) is None:
+        return None
+
+    directory = directory.joinpath(name)
+    try:
+        directory.mkdir(exist_ok=True)
+    except OSError:
+        return None
+
+    return directory
+
+
+def atomic_write(path: Path, data: bytes | str) -> bool:
+    """Write `data` to a temporary file and move it over `path`, so readers
+    never see a partial file. Returns whether it was written."""
+
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb" if isinstance(data, bytes) else "w") as stream:
+            stream.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        return False
+
+    return True
+
 
-__all__ = ["read_function_signature", "config_func"]
+def is_url(source: str) -> bool:
+    return source.startswith(_URL_SCHEMES)
+
+
+def split_profile(source: str) -> tuple[str, str | None]:
+    """Split `configs.json#profile` (or a URL with a fragment) into the file and
+    the profile name. A local file whose name contains '#' is left whole."""
+
+    if is_url(source):
+        url, profile = urllib.parse.urldefrag(source)
+        return url, profile or None
+
+    head, sep, profile = source.rpartition("#")
+    if not sep or not profile or os.sep in profile or os.path.exists(source):
+        return source, None
+    return head, profile
+
+
+def config_source(token: str) -> Path | str:
+    """A config path, or an http(s) URL which is kept as given."""
+    return token if is_url(token) else Path(token)
 
 
 def config_func(
-    path: Path | None = None, *, config_name: str, config_ext: str
-) -> Path | None:
-    """Path to a config file that contains additional args.
+    path: Path | str | None = None, *, config_name: str, config_ext: str
+) -> Path | str | None:
+    """Path or URL of a config file that contains additional args. Append
+    '#name' to read only the profile `name` (a top-level key) of the file.
     If '-c' is specified but no path is given, the directory of the script
     entry point will be searched for a config.json file."""
 
@@ -22,7 +116,12 @@ def config_func(
         ).exists():
             return p
         raise FileNotFoundError(f"File {p} not found")
-    return path.resolve(strict=True)
+    if isinstance(path, str):
+        return path
+
+    file, profile = split_profile(str(path))
+    resolved = Path(file).resolve(strict=True)
+    return resolved if profile is None else Path(f"{resolved}#{profile}")
 
 
 def read_function_signature(func: Callable[..., Any]) -> FuncSignature:
@@ -43,23 +142,38 @@ def read_function_signature(func: Callable[..., Any]) -> FuncSignature:
         func_type = FuncType.STATIC_METHOD
 
     accepts_star: bool = False
+    packed: bool = False
     for param in function_parameters[func_type != FuncType.STATIC_METHOD :]:
         if param.kind == param.VAR_KEYWORD or param.kind == param.KEYWORD_ONLY:
             continue
 
+        if packed:
+            raise ArgumentError(
+                f"Parameter {param.name!r} of {func.__qualname__} follows a parameter "
+                + "that consumes all remaining args"
+            )
+
         accepts_star = param.kind == param.VAR_POSITIONAL
         no_default = param.default == param.empty
 
-        min_params += no_default * (not accepts_star)
+        bulk_caster, packed = get_bulk_caster(param.annotation, accepts_star) or (
+            None,
+            False,
+        )
+
+        min_params += no_default * (not accepts_star) * (not packed)
         max_params += 1
 
-        param_data.append(
-            Parameter(
-                annotation=param.annotation,
-                default=null if no_default else param.default,
-                accepts_star=accepts_star,
-            )
+        parameter = Parameter(
+            annotation=param.annotation,
+            default=null if no_default else param.default,
+            accepts_star=accepts_star,
+            bulk_caster=bulk_caster,
+            packed=packed,
         )
+        if not packed:
+            parameter.caster = get_caster(param.annotation)
+        param_data.append(parameter)
 
         if accepts_star:
             break
@@ -77,7 +191,7 @@ def read_function_signature(func: Callable[..., Any]) -> FuncSignature:
 
     func_sig = FuncSignature(
         min_params=min_params,
-        max_params="+" if accepts_star else max_params,
+        max_params="+" if accepts_star or packed else max_params,
         parameters=param_data,
         d_type=d_type,
         constraints=constraints,
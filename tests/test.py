@@ -1,4 +1,5 @@
 import sys
+from array import array
 from pathlib import Path
 
 # isort: off
@@ -6,7 +7,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 sys.path.append(str(Path(__file__).parent.parent.joinpath("argparser")))
 # isort: on
 
-from argparser import GroupConfig, argument, parsing, types
+from argparser import GroupConfig, argument, parsing
 
 
 class Foo:
@@ -25,15 +26,18 @@ class Foo:
     def bar(self, num: int) -> bool:
         return num > 10
 
-    @argument.flag("a", kwargs={"inc": types.mut_wrap(0)}, re_set="t")
-    def arg_a(self, *, inc: types.mut_wrap[int]) -> int:
-        inc.o += 1
-        return inc.o
+    @argument.flag("a", accumulate=True)
+    def arg_a(self, *, count: int) -> int:
+        return count
 
     @argument.flag("b")
     def arg_b(self) -> bool:
         return True
 
+    @argument(accumulate=True, default=())
+    def tag(self, *tags: str) -> tuple[str, ...]:
+        return tags
+
 
 class Other:
     _conf = GroupConfig(usage_example="If you can't work this out, go fuck yourself")
@@ -51,14 +55,21 @@ class Other:
     def hi(self, num: int, name: str) -> tuple[int, str]:
         return num, name
 
+    @argument(default=array("q"))
+    def ids(self, ids: array[int]) -> array[int]:
+        """Ids to process"""
+        return ids
+
 
 parsing.set_root_group(Foo)
 parsing.add_group(Other)
-parsing.resolve()
-
-print(f"{Other.hi()=}")
-print(f"{Foo.string()=}")
-print(f"{Foo.bar()=}")
-print(f"{Foo.foo()=}")
-print(f"{Foo.arg_a()=}")
-print(f"{Foo.arg_b()=}")
+# Closes the resources (like mapped files) owned by the result
+with parsing.resolve():
+    print(f"{Other.hi()=}")
+    print(f"{Other.ids()=}")
+    print(f"{Foo.string()=}")
+    print(f"{Foo.bar()=}")
+    print(f"{Foo.foo()=}")
+    print(f"{Foo.arg_a()=}")
+    print(f"{Foo.arg_b()=}")
+    print(f"{Foo.tag()=}")
@@ -0,0 +1,73 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# isort: off
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent.joinpath("argparser")))
+# isort: on
+
+# A fresh cache, so the first read of every layer has to download it
+os.environ["ARGPARSER_CACHE_DIR"] = tempfile.mkdtemp()
+
+from argparser.parsing import config, remote
+
+READS = 5
+
+DOCS = {
+    "/base.json": {"foo": 1},
+    "/app.json": {"extends": "base.json", "bar": [1, 2]},
+}
+
+statuses: dict[str, list[int]] = {path: [] for path in DOCS}
+connections: list[int] = []
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        connections.append(1)
+        super().setup()
+
+    def log_message(self, *_: object) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        body = json.dumps(DOCS[self.path]).encode()
+        etag = f'"{len(body)}-{hash(body)}"'
+
+        status = 304 if self.headers.get("If-None-Match") == etag else 200
+        statuses[self.path].append(status)
+
+        self.send_response(status)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body) if status == 200 else 0))
+        self.end_headers()
+        if status == 200:
+            self.wfile.write(body)
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+url = f"http://127.0.0.1:{server.server_port}/app.json"
+
+try:
+    expected = config.read_config(url)
+    for _ in range(READS):
+        assert config.read_config(url) == expected, config.read_config(url)
+        assert config.is_current(url)
+finally:
+    server.shutdown()
+    server.server_close()
+    remote.close_connections()
+
+for path, got in statuses.items():
+    assert got[:1] == [200] and set(got[1:]) == {304}, f"{path}: {got}"
+assert len(connections) == 1, f"{len(connections)} connections"
+
+print(f"{len(DOCS)} layers x {READS} reads OK: {expected}")
@@ -0,0 +1,75 @@
+import sys
+import threading
+from pathlib import Path
+
+# isort: off
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent.joinpath("argparser")))
+# isort: on
+
+from argparser import argument, parsing
+
+THREADS = 32
+ITERATIONS = 200
+
+
+class Job:
+    def __init__(self) -> None:
+        self.offset = 1
+
+    @argument(position=0)
+    def name(cls, name: str) -> str:
+        return name
+
+    @argument()
+    def num(self, num: int) -> int:
+        return num + self.offset
+
+    @argument(default=list)
+    def tags(cls, *tags: str) -> list[str]:
+        return list(tags)
+
+
+class Worker:
+    @argument(default=0)
+    def id(cls, worker_id: int) -> int:
+        return worker_id
+
+
+parsing.set_root_group(Job)
+parsing.add_group(Worker)
+
+barrier = threading.Barrier(THREADS)
+failures: list[str] = []
+
+
+def run(thread_no: int) -> None:
+    barrier.wait()
+
+    for i in range(ITERATIONS):
+        argv = [f"job-{thread_no}", "--num", str(i), "--tags", str(thread_no), str(i)]
+        if i % 2:
+            argv += [":worker", "--id", str(thread_no)]
+
+        parsing.resolve(argv)
+
+        expected = (
+            f"job-{thread_no}",
+            i + 1,
+            [str(thread_no), str(i)],
+            thread_no if i % 2 else 0,
+        )
+        got = (Job.name(), Job.num(), Job.tags(), Worker.id())
+
+        if got != expected:
+            failures.append(f"thread {thread_no}: expected {expected}, got {got}")
+
+
+threads = [threading.Thread(target=run, args=(c,)) for c in range(THREADS)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+
+assert not failures, "\n".join(failures[:10])
+print(f"{THREADS} threads x {ITERATIONS} parses OK")